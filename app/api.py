@@ -1,5 +1,6 @@
 from fastapi import FastAPI
-from app.routers import countries, topics, indicators_meta, indicator_values
+from app.routers import countries, topics, indicators_meta, indicator_values, series, aggregates, exports, search, metrics
+from app.utils.cache import install_cache
 
 
 def create_app() -> FastAPI:
@@ -14,5 +15,12 @@ def create_app() -> FastAPI:
     app.include_router(topics.router, prefix="/topics", tags=["Topics"])
     app.include_router(indicators_meta.router, prefix="/indicators-meta", tags=["Indicators Metadata"])
     app.include_router(indicator_values.router, prefix="/indicator-values", tags=["Indicator Values"])
+    app.include_router(series.router, prefix="/series", tags=["Series"])
+    app.include_router(aggregates.router, prefix="/aggregates", tags=["Aggregates"])
+    app.include_router(search.router, prefix="/search", tags=["Search"])
+    app.include_router(exports.router, prefix="/exports", tags=["Exports"])
+    app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+
+    install_cache(app)
 
     return app
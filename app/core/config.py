@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Optional
 
 class Settings(BaseSettings):
     DB_USER: str = Field("postgres", env="DB_USER")
@@ -8,11 +9,85 @@ class Settings(BaseSettings):
     DB_PORT: str = Field("5432", env="DB_PORT")
     DB_NAME: str = Field("finalworldbank", env="DB_NAME")
 
+    # engine profile of this process: api, etl or dashboard
+    DB_PROFILE: str = Field("api", env="DB_PROFILE")
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_SLOW_QUERY_MS: float = 500.0
+    # per profile; a statement timeout of 0 disables it
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    ETL_DB_POOL_SIZE: int = 4
+    ETL_DB_MAX_OVERFLOW: int = 4
+    ETL_DB_STATEMENT_TIMEOUT_MS: int = 0
+    DASHBOARD_DB_POOL_SIZE: int = 3
+    DASHBOARD_DB_MAX_OVERFLOW: int = 2
+    DASHBOARD_DB_STATEMENT_TIMEOUT_MS: int = 60000
+
     MIN_YEAR: int = 2000
     MAX_YEAR: int = 2023
+    # bounds of the year_min / year_max query parameters
+    API_YEAR_MIN: int = 1900
+    API_YEAR_MAX: int = 2100
+
+    WB_API_BASE_URL: str = Field("http://api.worldbank.org/v2", env="WB_API_BASE_URL")
+    WB_PER_PAGE: int = 1000
+    WB_MRV: Optional[int] = None
+    WB_GAPFILL: bool = False
+    EXTRACT_REPORT_SAVINGS: bool = False  # one extra unfiltered request per indicator, for a log line
+    HTTP_TIMEOUT: float = 60.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 8
+    HTTP_MAX_RETRIES: int = 5
+    HTTP_BACKOFF_BASE: float = 0.5
+    HTTP_BACKOFF_MAX: float = 30.0
+    HTTP_RATE_LIMIT: float = 20.0  # requests/sec per process; 0 disables
+    HTTP_RATE_BURST: int = 20
+    HTTP_CACHE: bool = True
+    HTTP_CACHE_DIR: str = ".cache/wb_http"
+    HTTP_CACHE_TTL: float = 24 * 3600.0
+    HTTP_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+    HTTP_OFFLINE: bool = False
+    LANDING_ENABLED: bool = True
+    LANDING_DIR: str = "data/landing"
+    LANDING_KEEP_RUNS: int = 3
+    ETL_INDICATOR_CONCURRENCY: int = 4
+    DIM_BATCH_SIZE: int = 1000
+
+    ETL_MODE: str = "batch"
+    STREAM_QUEUE_PAGES: int = 8
+    STREAM_BATCH_ROWS: int = 50000
+    ETL_WORKERS: int = 1
+    ETL_SHARD_SIZE: int = 25
+    ETL_MAX_ATTEMPTS: int = 3
+    ETL_REPLAY_WORKERS: int = 0  # 0 = one per CPU
+
+    LOG_DB_SINK: str = "batched"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 200
+    LOG_FLUSH_INTERVAL: float = 1.0
+    LOG_OVERFLOW: str = "drop"
+
+    BULK_MAX_ROWS: int = 10000
+    BULK_MAX_BODY_BYTES: int = 8 * 1024 * 1024
+    STREAM_CHUNK_ROWS: int = 5000
+    EXPORT_CHUNK_ROWS: int = 100000
+
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = Field("redis://localhost:6379/0", env="CACHE_REDIS_URL")
+    CACHE_TTL: float = 300.0
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_VERSION_CHECK_INTERVAL: float = 1.0
+    REGISTRY_CHECK_INTERVAL: float = 1.0
 
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
 settings = Settings()
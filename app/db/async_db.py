@@ -0,0 +1,20 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.config import settings
+from app.db.db import pool_options, statement_timeout
+from app.db.instrumentation import EngineMetrics, instrument_engine, instrumented_pool_class
+
+_options = pool_options("api")
+_metrics = EngineMetrics("api-async", _options["max_overflow"])
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, _metrics),
+    connect_args={"server_settings": {"statement_timeout": str(statement_timeout("api"))}},
+    **_options,
+)
+instrument_engine(async_engine.sync_engine, _metrics)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
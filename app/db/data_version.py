@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.models import DataVersion
+
+# one counter covers every table the API reads
+DATA_VERSION = "data"
+# moves only when topics, indicators or countries change; keys the dimension registry
+DIMENSION_VERSION = "dimensions"
+
+
+def bump_data_version(session, dimensions=False):
+    """Increment the data version inside ``session``'s transaction; the caller commits.
+
+    ``dimensions`` also increments the dimension version, for writes to the dimension tables.
+    """
+    names = [DATA_VERSION, DIMENSION_VERSION] if dimensions else [DATA_VERSION]
+    now = datetime.now()
+    stmt = insert(DataVersion).values([{"name": name, "version": 1, "updated_at": now} for name in names])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": DataVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+    )
+    session.execute(stmt)
+
+
+def current_data_version(session, name=DATA_VERSION):
+    return session.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar() or 0
+
+
+async def current_data_version_async(db, name=DATA_VERSION):
+    return (await db.execute(select(DataVersion.version).where(DataVersion.name == name))).scalar() or 0
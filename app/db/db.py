@@ -1,8 +1,46 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.db.instrumentation import EngineMetrics, instrument_engine, instrumented_pool_class
 
-engine = create_engine(settings.DATABASE_URL)
+PROFILES = ("api", "etl", "dashboard")
+
+
+def pool_options(profile):
+    """Pool arguments for ``profile``; the api profile reads the unprefixed ``DB_*`` settings."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DB profile: {profile}")
+    prefix = "" if profile == "api" else f"{profile.upper()}_"
+    return {
+        "pool_size": getattr(settings, f"{prefix}DB_POOL_SIZE"),
+        "max_overflow": getattr(settings, f"{prefix}DB_MAX_OVERFLOW"),
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def statement_timeout(profile):
+    prefix = "" if profile == "api" else f"{profile.upper()}_"
+    return getattr(settings, f"{prefix}DB_STATEMENT_TIMEOUT_MS")
+
+
+def make_engine(profile=None):
+    profile = profile or settings.DB_PROFILE
+    options = pool_options(profile)
+    metrics = EngineMetrics(profile, options["max_overflow"])
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        connect_args={"options": f"-c statement_timeout={statement_timeout(profile)}"},
+        **options,
+    )
+    instrument_engine(engine, metrics)
+    return engine
+
+
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from loguru import logger  # not app.utils.logger, which imports app.db.db
+
+# metrics of every engine created in this process, by name
+ENGINE_METRICS = {}
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else None
+
+
+class EngineMetrics:
+    """Checkout waits and query timings of one engine, with the latest ``window`` samples kept for percentiles."""
+
+    def __init__(self, name, max_overflow, window=1000):
+        self.name = name
+        self.max_overflow = max_overflow
+        self.engine = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.queries = 0
+        self.slow_queries = 0
+        self._waits = deque(maxlen=window)
+        self._query_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_ms, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self._waits.append(wait_ms)
+
+    def record_query(self, elapsed_ms, slow):
+        with self._lock:
+            self.queries += 1
+            self.slow_queries += slow
+            self._query_times.append(elapsed_ms)
+
+    def snapshot(self):
+        with self._lock:
+            waits, query_times = sorted(self._waits), sorted(self._query_times)
+            pool = self.engine.pool
+            return {
+                "name": self.name,
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": self.max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "checkout_wait_p50_ms": _percentile(waits, 0.5),
+                "checkout_wait_p95_ms": _percentile(waits, 0.95),
+                "checkout_wait_max_ms": waits[-1] if waits else None,
+                "queries": self.queries,
+                "slow_queries": self.slow_queries,
+                "query_p50_ms": _percentile(query_times, 0.5),
+                "query_p95_ms": _percentile(query_times, 0.95),
+            }
+
+
+class _TimedCheckout:
+    """Pool mixin timing how long a checkout waits for a free connection (or to open a new one)."""
+    metrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_checkout((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.record_checkout((time.perf_counter() - start) * 1000)
+        return conn
+
+
+def instrumented_pool_class(pool_class, metrics):
+    # the metrics ride on the class, so they survive Pool.recreate() after an invalidation
+    return type(f"Instrumented{pool_class.__name__}", (_TimedCheckout, pool_class), {"metrics": metrics})
+
+
+def instrument_engine(engine, metrics, slow_query_ms=None):
+    """Time every statement on ``engine`` and log the ones slower than ``slow_query_ms``."""
+    slow_query_ms = settings.DB_SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms
+    metrics.engine = engine
+    ENGINE_METRICS[metrics.name] = metrics
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        slow = elapsed_ms >= slow_query_ms
+        metrics.record_query(elapsed_ms, slow)
+        if slow:
+            logger.warning(f"Slow query on {metrics.name} ({elapsed_ms:.0f} ms): {' '.join(statement.split())[:500]}")
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # a failed statement never reaches after_cursor_execute
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
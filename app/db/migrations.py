@@ -0,0 +1,70 @@
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from app.db.db import engine
+from app.models.models import Base
+from app.utils.logger import logger
+
+INVALID_INDEXES_SQL = text("""
+    SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid AND c.relname = ANY(:names)
+""")
+
+# 1 if uix_indicator_country_date exists without INCLUDE columns
+UNCOVERED_UNIQUE_SQL = text("""
+    SELECT 1 FROM pg_index WHERE indexrelid = to_regclass('uix_indicator_country_date') AND indnkeyatts = indnatts
+""")
+
+
+def cover_unique_key(conn):
+    """Rebuild ``uix_indicator_country_date`` with ``value`` included, as the models now declare it.
+
+    Databases created earlier have the plain unique key plus a separate covering index on the same
+    columns; the covered key replaces both, so writes maintain one B-tree instead of two. The new
+    index is built concurrently and swapped in under the constraint in one statement.
+    """
+    if conn.execute(UNCOVERED_UNIQUE_SQL).scalar():
+        logger.info("Rebuilding uix_indicator_country_date to include value")
+        # a leftover from an interrupted build is dropped first
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS uix_indicator_country_date_covering"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX CONCURRENTLY uix_indicator_country_date_covering "
+            "ON indicator_values (indicator_id, country_id, date) INCLUDE (value)"
+        ))
+        conn.execute(text(
+            "ALTER TABLE indicator_values DROP CONSTRAINT uix_indicator_country_date, "
+            "ADD CONSTRAINT uix_indicator_country_date UNIQUE USING INDEX uix_indicator_country_date_covering"
+        ))
+    conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_indicator_values_indicator_country_date_value"))
+
+
+def ensure_indexes(bind=engine):
+    """Create every index declared on the models that an existing database is missing.
+
+    ``create_all`` only builds indexes together with new tables, so databases created before an
+    index was added need this. Indexes are built ``CONCURRENTLY`` so writers are not blocked. An
+    invalid index left behind by an interrupted build is dropped and rebuilt, and the unique key of
+    ``indicator_values`` is upgraded by ``cover_unique_key``. Returns the names of the indexes that
+    were (re)built.
+    """
+    indexes = [index for table in Base.metadata.sorted_tables for index in table.indexes]
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        cover_unique_key(conn)
+        existing = set(conn.execute(text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")).scalars())
+        invalid = set(conn.execute(INVALID_INDEXES_SQL, {"names": [i.name for i in indexes]}).scalars())
+
+        built = []
+        for index in indexes:
+            if index.name in existing and index.name not in invalid:
+                continue
+            if index.name in invalid:
+                conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+            ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+            logger.info(f"Building index {index.name}")
+            conn.execute(text(ddl.replace(" INDEX ", " INDEX CONCURRENTLY ", 1)))
+            built.append(index.name)
+
+        for table in {index.table.name for index in indexes if index.name in built}:
+            conn.execute(text(f'ANALYZE "{table}"'))
+    return built
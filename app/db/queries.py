@@ -0,0 +1,24 @@
+from sqlalchemy import select
+
+from app.models.models import Country, IndicatorMeta, IndicatorValue
+
+
+def indicator_data_query(indicator_ids, country_ids, year_min, year_max):
+    """The dashboard's chart data: every selected indicator x country x year, joined to the names.
+
+    Built here rather than in the Streamlit app so scripts/check_query_plans.py EXPLAINs the same statement.
+    """
+    return (
+        select(
+            IndicatorValue.indicator_id,
+            IndicatorMeta.name.label("indicator"),
+            Country.name.label("country"),
+            IndicatorValue.date.label("year"),
+            IndicatorValue.value,
+        )
+        .join(IndicatorMeta, IndicatorMeta.id == IndicatorValue.indicator_id)
+        .join(Country, Country.id == IndicatorValue.country_id)
+        .where(IndicatorValue.indicator_id.in_(indicator_ids))
+        .where(IndicatorValue.country_id.in_(country_ids))
+        .where(IndicatorValue.date >= year_min, IndicatorValue.date <= year_max)
+    )
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.data_version import DIMENSION_VERSION, current_data_version, current_data_version_async
+from app.models.models import Country, IndicatorMeta
+
+
+class DimensionRegistry:
+    """Indicator code <-> id and country iso3 <-> id maps, shared by the loader and the API.
+
+    Loaded with two column-only queries and reloaded only when the dimension version moves, which
+    ``load_dimensions`` and the dimension write routes bump. The version itself is re-read at most
+    every ``interval`` seconds.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = settings.REGISTRY_CHECK_INTERVAL if interval is None else interval
+        self.version = None
+        self.indicator_ids = {}
+        self.indicator_codes = {}
+        self.country_ids = {}
+        self.country_codes = {}
+        self._indicators_upper = {}
+        self._checked_at = 0.0
+        # guards only the in-memory swap; never held across a query
+        self._lock = threading.Lock()
+        # coalesces concurrent async refreshes; created on first use in the running loop
+        self._async_lock = None
+        self._async_loop = None
+
+    def stale(self):
+        return self.version is None or time.monotonic() - self._checked_at >= self.interval
+
+    def expire(self):
+        with self._lock:
+            self._checked_at = 0.0
+
+    def _install(self, version, indicators, countries):
+        """Swap in maps built from ``indicators`` and ``countries`` rows, unless ``version`` is already loaded."""
+        with self._lock:
+            if indicators is not None and version != self.version:
+                self.indicator_ids = dict(indicators)
+                self.indicator_codes = {id_: code for code, id_ in indicators}
+                self._indicators_upper = {code.upper(): id_ for code, id_ in indicators}
+                self.country_ids = dict(countries)
+                self.country_codes = {id_: iso3 for iso3, id_ in countries}
+                self.version = version
+            self._checked_at = time.monotonic()
+        return self
+
+    def refresh(self, session, force=False):
+        """Reload the maps through ``session`` if the dimension version moved.
+
+        The version is only re-read once the check interval has passed, unless ``force`` is set.
+        """
+        if not force and not self.stale():
+            return self
+        version = current_data_version(session, DIMENSION_VERSION)
+        indicators = countries = None
+        if version != self.version:
+            indicators = session.execute(select(IndicatorMeta.code, IndicatorMeta.id)).all()
+            countries = session.execute(select(Country.iso3, Country.id)).all()
+        return self._install(version, indicators, countries)
+
+    def _lock_for_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_lock, self._async_loop = asyncio.Lock(), loop
+        return self._async_lock
+
+    async def refresh_async(self, db: AsyncSession, force=False):
+        """``refresh`` on an async session, awaiting each query so the event loop keeps running.
+
+        Requests that find the registry stale while another is reloading it wait for that reload
+        instead of issuing their own; forced refreshes are serialised but always re-read.
+        """
+        if not force and not self.stale():
+            return self
+        async with self._lock_for_loop():
+            if not force and not self.stale():
+                # refreshed by the request we waited for
+                return self
+            version = await current_data_version_async(db, DIMENSION_VERSION)
+            indicators = countries = None
+            if version != self.version:
+                indicators = (await db.execute(select(IndicatorMeta.code, IndicatorMeta.id))).all()
+                countries = (await db.execute(select(Country.iso3, Country.id))).all()
+            return self._install(version, indicators, countries)
+
+    def indicator_id(self, code):
+        """Id of an indicator code, matched case-insensitively as the API accepts it."""
+        return self._indicators_upper.get(code.upper())
+
+    def country_id(self, iso3):
+        return self.country_ids.get(iso3.upper())
+
+
+registry = DimensionRegistry()
+
+
+def current_registry(session):
+    return registry.refresh(session)
+
+
+async def current_registry_async(db: AsyncSession, force=False):
+    return await registry.refresh_async(db, force)
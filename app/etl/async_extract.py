@@ -0,0 +1,267 @@
+import asyncio
+import math
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.etl.extract import indicator_values_params
+from app.etl.http_client import AsyncHttpClient, InvalidPage
+from app.utils.logger import logger
+
+
+@dataclass
+class ExtractStats:
+    """Transfer counters for one indicator, compared against an unfiltered full-history pull."""
+    pages: int = 0
+    bytes: int = 0
+    records: int = 0
+    full_total: Optional[int] = None
+
+    @property
+    def full_pages(self):
+        if self.full_total is None:
+            return None
+        return max(1, math.ceil(self.full_total / settings.WB_PER_PAGE))
+
+    @property
+    def pages_saved(self):
+        return None if self.full_pages is None else max(0, self.full_pages - self.pages)
+
+    @property
+    def bytes_saved(self):
+        """Estimated from the average fetched record size."""
+        if self.full_total is None or not self.records:
+            return None
+        return max(0, round(self.bytes / self.records * (self.full_total - self.records)))
+
+
+class AsyncExtractor:
+    """Concurrent World Bank v2 client sharing one pooled HTTP client.
+
+    Page 1 of a resource is fetched first to learn ``pages``; the remaining pages
+    are then requested concurrently. Requests are capped per host, and
+    ``fetch_many_indicator_values`` additionally caps how many indicators are in flight.
+    Retries, rate limiting and the page cache come from ``AsyncHttpClient``.
+    """
+
+    def __init__(self, base_url=None, max_per_host=None, max_indicators=None, timeout=None):
+        self.base_url = (base_url or settings.WB_API_BASE_URL).rstrip("/")
+        self.max_per_host = max_per_host or settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self.max_indicators = max_indicators or settings.ETL_INDICATOR_CONCURRENCY
+        self.timeout = timeout or settings.HTTP_TIMEOUT
+        self._client = None
+        self._host_limits = {}
+        self.stats = {}
+
+    async def __aenter__(self):
+        self._client = AsyncHttpClient(timeout=self.timeout, max_connections=self.max_per_host)
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.__aexit__(*exc)
+        self._client = None
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def _get_page(self, url, page, stats=None, cache=True, version=None, **params):
+        params = {"format": "json", "per_page": settings.WB_PER_PAGE, "page": page, **params}
+        async with self._host_limit(url):
+            data, size = await self._client.get_page(url, params, cache=cache, version=version)
+        if stats is not None:
+            stats.pages += 1
+            stats.bytes += size
+        return data
+
+    async def fetch_pages(self, path, stats=None, version=None, **params):
+        """Records of every page of ``path``; a page that still fails after retries, or a later page
+        that is not a ``[header, records]`` pair, raises rather than truncating the result."""
+        url = f"{self.base_url}/{path}"
+        first = await self._get_page(url, 1, stats, version=version, **params)
+        if first is None:
+            return []
+        records = list(first[1] or [])
+        pages = first[0].get("pages") or 1
+        if pages <= 1:
+            return records
+
+        rest = await asyncio.gather(*(
+            self._get_page(url, page, stats, version=version, **params) for page in range(2, pages + 1)
+        ))
+        for page, data in enumerate(rest, start=2):
+            if data is None:
+                raise InvalidPage(f"Page {page} of {url} is not a [header, records] pair")
+            records.extend(data[1] or [])
+        return records
+
+    async def _full_total(self, path):
+        """Record count of the unfiltered history, for the savings stats only; ``None`` if the probe fails."""
+        try:
+            full = await self._get_page(f"{self.base_url}/{path}", 1, per_page=1)
+        except httpx.HTTPError as e:
+            logger.warning(f"Savings probe failed for {path}; no savings reported. Error: {e}")
+            return None
+        return full[0].get("total") if full else None
+
+    async def fetch_indicator_values(self, indicator_code, version=None):
+        stats = ExtractStats()
+        path = f"country/all/indicator/{indicator_code}"
+        if settings.EXTRACT_REPORT_SAVINGS:
+            records, stats.full_total = await asyncio.gather(
+                self.fetch_pages(path, stats, version, **indicator_values_params()),
+                self._full_total(path),
+            )
+        else:
+            records = await self.fetch_pages(path, stats, version, **indicator_values_params())
+        stats.records = len(records)
+        self.stats[indicator_code] = stats
+        return records
+
+    async def fetch_indicator_header(self, indicator_code):
+        """Page-1 header (``total``, ``lastupdated``, ...) for the configured window, one record long.
+
+        Never served from the page cache: it is what tells a run whether the source changed.
+        """
+        url = f"{self.base_url}/country/all/indicator/{indicator_code}"
+        data = await self._get_page(url, 1, cache=False, per_page=1, **indicator_values_params())
+        return data[0] if data else None
+
+    async def fetch_many_indicator_headers(self, indicator_codes):
+        async def fetch_one(code):
+            try:
+                return code, await self.fetch_indicator_header(code)
+            except httpx.HTTPError as e:
+                logger.warning(f"Failed to probe indicator: {code}. Error: {e}")
+                return code, None
+
+        results = await asyncio.gather(*(fetch_one(code) for code in indicator_codes))
+        return dict(results)
+
+    async def _fetch_values_or_none(self, code, version):
+        try:
+            return await self.fetch_indicator_values(code, version)
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch indicator: {code}. Error: {e}")
+            return None
+
+    async def fetch_many_indicator_values(self, indicator_codes, versions=None):
+        in_flight = asyncio.Semaphore(self.max_indicators)
+        versions = versions or {}
+
+        async def fetch_one(code):
+            async with in_flight:
+                return code, await self._fetch_values_or_none(code, versions.get(code))
+
+        results = await asyncio.gather(*(fetch_one(code) for code in indicator_codes))
+        return dict(results)
+
+    async def deliver_many_indicator_values(self, indicator_codes, deliver, versions=None):
+        """Like ``fetch_many_indicator_values``, but ``await deliver(code, records)`` as each indicator
+        completes instead of collecting them. An indicator keeps its slot until ``deliver`` returns, so
+        a slow consumer holds back new fetches rather than letting results pile up."""
+        in_flight = asyncio.Semaphore(self.max_indicators)
+        versions = versions or {}
+
+        async def fetch_one(code):
+            async with in_flight:
+                await deliver(code, await self._fetch_values_or_none(code, versions.get(code)))
+
+        await asyncio.gather(*(fetch_one(code) for code in indicator_codes))
+
+
+def fetch_many_indicator_headers(indicator_codes, **kwargs):
+    """Probe several indicators concurrently; returns ``{code: header or None}``."""
+    async def run():
+        async with AsyncExtractor(**kwargs) as extractor:
+            return await extractor.fetch_many_indicator_headers(indicator_codes)
+
+    return asyncio.run(run())
+
+
+def fetch_many_indicator_values(indicator_codes, stats=None, versions=None, **kwargs):
+    """Fetch several indicators concurrently; returns ``{code: records}`` in input order.
+
+    An indicator whose fetch raised maps to ``None`` rather than an empty list.
+    Pass a dict as ``stats`` to receive an ``ExtractStats`` per indicator, and ``{code: source
+    version}`` as ``versions`` so cached pages are only reused while the source is unchanged.
+    """
+    async def run():
+        async with AsyncExtractor(**kwargs) as extractor:
+            fetched = await extractor.fetch_many_indicator_values(indicator_codes, versions)
+            if stats is not None:
+                stats.update(extractor.stats)
+            return fetched
+
+    return asyncio.run(run())
+
+
+class _Stopped(Exception):
+    """Raised into the fetches once the consumer of ``iter_indicator_values`` has gone away."""
+
+
+def iter_indicator_values(indicator_codes, stats=None, versions=None, **kwargs):
+    """Yield ``(code, records)`` for each indicator as it completes, in completion order.
+
+    One ``AsyncExtractor`` serves all of ``indicator_codes`` from an event loop in a background
+    thread, so connections stay pooled for the whole run and a new fetch starts as soon as any
+    finishes. Results wait in a queue of ``ETL_INDICATOR_CONCURRENCY`` slots, which bounds how many
+    are held at once. ``stats`` and ``versions`` are as for ``fetch_many_indicator_values``; an
+    indicator's stats are in ``stats`` by the time it is yielded.
+    """
+    results = queue.Queue(maxsize=settings.ETL_INDICATOR_CONCURRENCY)
+    stop = threading.Event()
+    end = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped
+
+    async def run():
+        async with AsyncExtractor(**kwargs) as extractor:
+            async def deliver(code, records):
+                if stats is not None and code in extractor.stats:
+                    stats[code] = extractor.stats[code]
+                await asyncio.to_thread(put, (code, records))
+
+            await extractor.deliver_many_indicator_values(indicator_codes, deliver, versions)
+
+    def produce():
+        # the consumer waits for the end marker, so one is sent however the fetches finish
+        try:
+            asyncio.run(run())
+            put((end, None))
+        except _Stopped:
+            pass
+        except BaseException as e:
+            try:
+                put((end, e))
+            except _Stopped:
+                pass
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            code, records = results.get()
+            if code is end:
+                if records is not None:
+                    raise records
+                return
+            yield code, records
+    finally:
+        stop.set()
+        producer.join()
@@ -1,56 +1,76 @@
-import requests
+from app.core.config import settings
+from app.etl.http_client import HttpClient, InvalidPage
 from app.utils.logger import logger
 
-def fetch_indicator_metadata():
-    indicators = []
+def _iter_pages(http, url, version=None, **params):
+    """Each ``[header, records]`` page of ``url``; nothing if page 1 is not a page (an API error body)."""
     page = 1
     while True:
-        url = f"http://api.worldbank.org/v2/indicator?format=json&per_page=1000&page={page}"
-        res = requests.get(url)
-        if res.status_code != 200: break
-        data = res.json()
-        if not data or len(data) < 2: break
-        indicators.extend(data[1])
+        data, _ = http.get_page(url, {"format": "json", "per_page": settings.WB_PER_PAGE, "page": page, **params},
+                                version=version)
+        if data is None:
+            if page == 1: return
+            raise InvalidPage(f"Page {page} of {url} is not a [header, records] pair")
+        yield data
         if page >= data[0]['pages']: break
         page += 1
+
+def _fetch_all_pages(http, path, **params):
+    """Records of every page of ``path``. A page that still fails after retries, or a later page that is
+    not a ``[header, records]`` pair, raises ``httpx.HTTPError`` rather than ending the walk early."""
+    records = []
+    for data in _iter_pages(http, f"{settings.WB_API_BASE_URL}/{path}", **params):
+        records.extend(data[1] or [])
+    return records
+
+def fetch_indicator_metadata():
+    with HttpClient() as http:
+        indicators = _fetch_all_pages(http, "indicator")
     logger.info(f"Fetched {len(indicators)} indicators")
     return indicators
 
-def fetch_indicator_values(indicator_code):
+def indicator_values_params():
+    """Query parameters limiting a values request to the configured window.
+
+    With ``WB_MRV`` set the API is asked for the most recent N values per country
+    (optionally gap-filled) instead of the ``MIN_YEAR:MAX_YEAR`` date range.
+    """
+    if settings.WB_MRV:
+        params = {"mrv": settings.WB_MRV}
+        if settings.WB_GAPFILL:
+            params["gapfill"] = "Y"
+        return params
+    return {"date": f"{settings.MIN_YEAR}:{settings.MAX_YEAR}"}
+
+def iter_indicator_value_pages(indicator_code, http=None, version=None):
+    """Yield the records of each page as it arrives; pass an open ``HttpClient`` to reuse connections.
+
+    ``version`` is the source watermark the pages must have been cached under to be served locally.
+    """
+    if http is None:
+        with HttpClient() as http:
+            yield from iter_indicator_value_pages(indicator_code, http, version)
+        return
+    url = f"{settings.WB_API_BASE_URL}/country/all/indicator/{indicator_code}"
+    for data in _iter_pages(http, url, version, **indicator_values_params()):
+        yield data[1] or []
+
+def fetch_indicator_values(indicator_code, version=None):
     all_data = []
-    page = 1
-    while True:
-        url = f"http://api.worldbank.org/v2/country/all/indicator/{indicator_code}?format=json&per_page=1000&page={page}"
-        res = requests.get(url)
-        if res.status_code != 200: break
-        data = res.json()
-        if not data or len(data) < 2: break
-        all_data.extend(data[1])
-        if page >= data[0]['pages']: break
-        page += 1
+    for records in iter_indicator_value_pages(indicator_code, version=version):
+        all_data.extend(records)
     # logger.info(f"Fetched {len(all_data)} indicator values for {indicator_code}")
     return all_data
 
 def fetch_all_countries():
-    countries = []
-    page = 1
-    while True:
-        url = f"http://api.worldbank.org/v2/country?format=json&per_page=1000&page={page}"
-        res = requests.get(url)
-        if res.status_code != 200: break
-        data = res.json()
-        if not data or len(data) < 2: break
-        countries.extend(data[1])
-        if page >= data[0]['pages']: break
-        page += 1
+    with HttpClient() as http:
+        countries = _fetch_all_pages(http, "country")
     logger.info(f"Fetched {len(countries)} countries")
     return countries
 
 def fetch_all_topics():
-    url = "http://api.worldbank.org/v2/topic?format=json"
-    res = requests.get(url)
-    if res.status_code != 200: return []
-    data = res.json()
-    topics = data[1] if data and len(data) > 1 else []
+    with HttpClient() as http:
+        data, _ = http.get_page(f"{settings.WB_API_BASE_URL}/topic", {"format": "json"})
+    topics = (data[1] or []) if data else []
     logger.info(f"Fetched {len(topics)} topics")
     return topics
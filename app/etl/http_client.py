@@ -0,0 +1,352 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import httpx
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+# statuses worth retrying; any other non-200 raises at once
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class OfflineCacheMiss(httpx.TransportError):
+    """Raised in offline mode for a request the page cache cannot serve."""
+
+
+class InvalidPage(httpx.DecodingError):
+    """Raised for a successful response whose body is not JSON, or for a page after the first that is
+    not a ``[header, records]`` pair."""
+
+
+def parse_page(body):
+    """``[header, records]`` of a World Bank v2 page, or ``None`` for JSON of any other shape, such as
+    the API's ``[{"message": ...}]`` error body. Raises ``InvalidPage`` if ``body`` is not JSON."""
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise InvalidPage(f"Response is not JSON: {e}") from e
+    if isinstance(data, list) and len(data) == 2 and isinstance(data[0], dict) and "pages" in data[0]:
+        return data
+    return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second with bursts of up to ``burst``.
+
+    A caller takes its token up front and sleeps until it is due, so the sync and async clients of a
+    process can share one bucket. ``rate`` <= 0 disables limiting.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = settings.HTTP_RATE_LIMIT if rate is None else rate
+        self.burst = max(1, burst or settings.HTTP_RATE_BURST)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class PageCache:
+    """Gzip-compressed raw response bodies on disk, addressed by a hash of the request URL.
+
+    Each entry records when it was fetched and an optional source ``version``; a lookup that names a
+    version only matches entries stored under it. Entries older than ``ttl`` seconds are misses unless
+    ``offline``. Once the directory grows past ``max_bytes``, the least recently used entries are
+    deleted down to 90% of it. Writes go through a temp file and a rename, so worker processes can
+    share the directory.
+    """
+
+    def __init__(self, directory=None, ttl=None, max_bytes=None, offline=None):
+        self.directory = Path(directory or settings.HTTP_CACHE_DIR)
+        self.ttl = settings.HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = max_bytes or settings.HTTP_CACHE_MAX_BYTES
+        self.offline = settings.HTTP_OFFLINE if offline is None else offline
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, params=None):
+        request_url = httpx.URL(url, params=sorted((params or {}).items()))
+        return hashlib.sha256(str(request_url).encode()).hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def get(self, key, version=None):
+        path = self._path(key)
+        try:
+            meta, _, body = gzip.decompress(path.read_bytes()).partition(b"\n")
+        except (OSError, EOFError):
+            self.misses += 1
+            return None
+        meta = json.loads(meta)
+        stale = not self.offline and time.time() - meta["fetched_at"] > self.ttl
+        if stale or (version is not None and meta.get("version") != version):
+            self.misses += 1
+            return None
+        os.utime(path)  # mtime orders eviction
+        self.hits += 1
+        return body
+
+    def put(self, key, body, url=None, version=None):
+        meta = json.dumps({"url": url, "version": version, "fetched_at": time.time()}).encode()
+        data = gzip.compress(meta + b"\n" + body, compresslevel=6)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        return list(self.directory.glob("*/*.json.gz"))
+
+    def size(self):
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _evict(self):
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        target = self.max_bytes * 0.9
+        for _, n, p in entries:
+            if size <= target:
+                break
+            p.unlink(missing_ok=True)
+            size -= n
+            self.evictions += 1
+        logger.info(f"HTTP page cache evicted down to {size} bytes ({self.evictions} entries so far)")
+        self._size = size
+
+    def clear(self):
+        for p in self._entries():
+            p.unlink(missing_ok=True)
+        self._size = 0
+
+
+# one bucket and one cache per process, shared by every client it creates
+_limiter = None
+_cache = None
+
+
+def rate_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = TokenBucket()
+    return _limiter
+
+
+def page_cache():
+    global _cache
+    if _cache is None and settings.HTTP_CACHE:
+        _cache = PageCache()
+    return _cache
+
+
+def backoff(attempt, retry_after=None):
+    """Seconds before retry ``attempt`` (0-based): the server's ``Retry-After`` if it sent one,
+    otherwise exponential with full jitter, capped at ``HTTP_BACKOFF_MAX``."""
+    if retry_after is not None:
+        return min(retry_after, settings.HTTP_BACKOFF_MAX)
+    return random.uniform(0, min(settings.HTTP_BACKOFF_MAX, settings.HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+def _retry_after(res):
+    value = res.headers.get("retry-after")
+    if value is None:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HttpBase:
+    def __init__(self, timeout=None, max_connections=None, cache=True, limiter=None, max_retries=None):
+        self.timeout = timeout or settings.HTTP_TIMEOUT
+        self.max_connections = max_connections or settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self.cache = page_cache() if cache is True else cache or None
+        self.limiter = limiter or rate_limiter()
+        self.max_retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.retries = 0
+
+    def _client_options(self):
+        return dict(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            follow_redirects=True,
+        )
+
+    def _cached(self, url, params, use_cache, version):
+        """``(key, body)``; ``body`` is the cached page or ``None``."""
+        if not (use_cache and self.cache):
+            if self.cache and self.cache.offline:
+                raise OfflineCacheMiss(f"Offline and not cacheable: {url}")
+            return None, None
+        key = self.cache.key(url, params)
+        body = self.cache.get(key, version)
+        if body is None and self.cache.offline:
+            raise OfflineCacheMiss(f"Offline and not cached: {url} {params or ''}")
+        return key, body
+
+    def _retry_delay(self, attempt, url, res=None, error=None):
+        """Seconds to wait before retrying, or ``None`` to give up (the caller then raises)."""
+        if attempt >= self.max_retries:
+            return None
+        if res is not None and res.status_code not in RETRY_STATUSES:
+            return None
+        delay = backoff(attempt, _retry_after(res) if res is not None else None)
+        reason = f"HTTP {res.status_code}" if res is not None else type(error).__name__
+        logger.warning(f"{reason} from {url}; retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+        self.retries += 1
+        return delay
+
+    def _store(self, key, res, version):
+        if key is not None:
+            self.cache.put(key, res.content, url=str(res.request.url), version=version)
+        return res.content
+
+    def _store_page(self, key, res, version):
+        """``(page, size)`` of a fresh response, stored only once its body has parsed as a page."""
+        page = parse_page(res.content)
+        if page is not None:
+            self._store(key, res, version)
+        return page, len(res.content)
+
+
+class HttpClient(_HttpBase):
+    """Pooled keep-alive client for the sync fetchers, with retries, rate limiting and the page cache.
+
+    ``get_bytes`` returns the body of a successful response and raises ``httpx.HTTPError`` for anything
+    else once retries are spent; ``get_page`` parses it with ``parse_page``.
+    """
+
+    def __enter__(self):
+        self._client = httpx.Client(**self._client_options())
+        return self
+
+    def __exit__(self, *exc):
+        self._client.close()
+
+    def _fetch(self, url, params):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                res = self._client.get(url, params=params)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(attempt, url, error=e)
+                if delay is None:
+                    raise
+            else:
+                if res.is_success:
+                    return res
+                delay = self._retry_delay(attempt, url, res=res)
+                if delay is None:
+                    res.raise_for_status()
+            time.sleep(delay)
+            attempt += 1
+
+    def get_bytes(self, url, params=None, cache=True, version=None):
+        key, body = self._cached(url, params, cache, version)
+        if body is not None:
+            return body
+        return self._store(key, self._fetch(url, params), version)
+
+    def get_page(self, url, params=None, cache=True, version=None):
+        """``(parse_page(body), len(body))``; only bodies that parse as a page are cached."""
+        key, body = self._cached(url, params, cache, version)
+        if body is not None:
+            return parse_page(body), len(body)
+        return self._store_page(key, self._fetch(url, params), version)
+
+
+class AsyncHttpClient(_HttpBase):
+    """``HttpClient`` for asyncio: same retries, rate limiter and page cache over ``httpx.AsyncClient``."""
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(**self._client_options())
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    async def _fetch(self, url, params):
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            try:
+                res = await self._client.get(url, params=params)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(attempt, url, error=e)
+                if delay is None:
+                    raise
+            else:
+                if res.is_success:
+                    return res
+                delay = self._retry_delay(attempt, url, res=res)
+                if delay is None:
+                    res.raise_for_status()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get_bytes(self, url, params=None, cache=True, version=None):
+        key, body = self._cached(url, params, cache, version)
+        if body is not None:
+            return body
+        return self._store(key, await self._fetch(url, params), version)
+
+    async def get_page(self, url, params=None, cache=True, version=None):
+        """``(parse_page(body), len(body))``; only bodies that parse as a page are cached."""
+        key, body = self._cached(url, params, cache, version)
+        if body is not None:
+            return parse_page(body), len(body)
+        return self._store_page(key, await self._fetch(url, params), version)
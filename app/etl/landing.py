@@ -0,0 +1,106 @@
+import gzip
+import os
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import orjson
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+# raw World Bank payloads, one gzip NDJSON record per line, partitioned Hive-style:
+#   {LANDING_DIR}/topics/run_date=2025-07-01/part-00000.ndjson.gz
+#   {LANDING_DIR}/values/indicator=NY.GDP.MKTP.CD/run_date=2025-07-01/part-00003.ndjson.gz
+# a partition is only read back once its _SUCCESS marker exists
+DIMENSION_ENTITIES = ("topics", "indicators", "countries")
+VALUES = "values"
+
+
+def landing_root():
+    return Path(settings.LANDING_DIR)
+
+
+def _entity_dir(entity, indicator=None):
+    path = landing_root() / entity
+    return path / f"indicator={indicator}" if indicator is not None else path
+
+
+def _write_part(directory, part, records):
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+        for record in records:
+            f.write(orjson.dumps(record))
+            f.write(b"\n")
+    os.replace(tmp, directory / f"part-{part:05d}.ndjson.gz")
+
+
+def _prune(entity_dir):
+    """Keep the newest LANDING_KEEP_RUNS run dates of a partition."""
+    runs = sorted(p for p in entity_dir.glob("run_date=*") if p.is_dir())
+    for old in runs[:-settings.LANDING_KEEP_RUNS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def land(entity, records, indicator=None, part=0, complete=True, run_date=None):
+    """Write ``records`` as part ``part`` of the ``run_date`` (default today) partition of ``entity``.
+
+    Part 0 starts the partition afresh, so a re-run on the same day replaces rather than mixes pages.
+    ``complete`` marks the partition finished; page-by-page writers pass ``False`` and call
+    ``complete_run`` after the last page. Does nothing unless LANDING_ENABLED. Failures are logged,
+    never raised: landing must not fail a load.
+    """
+    if not settings.LANDING_ENABLED:
+        return
+    directory = _entity_dir(entity, indicator) / f"run_date={run_date or date.today().isoformat()}"
+    try:
+        if part == 0:
+            shutil.rmtree(directory, ignore_errors=True)
+        _write_part(directory, part, records)
+    except OSError as e:
+        logger.warning(f"Could not land raw {entity} {indicator or ''}: {e}")
+        return
+    if complete:
+        complete_run(entity, indicator, run_date)
+
+
+def complete_run(entity, indicator=None, run_date=None):
+    """Mark a landed partition finished and drop all but the newest LANDING_KEEP_RUNS of its runs."""
+    if not settings.LANDING_ENABLED:
+        return
+    entity_dir = _entity_dir(entity, indicator)
+    try:
+        (entity_dir / f"run_date={run_date or date.today().isoformat()}" / "_SUCCESS").touch()
+        _prune(entity_dir)
+    except OSError as e:
+        logger.warning(f"Could not land raw {entity} {indicator or ''}: {e}")
+
+
+def latest_run(entity, indicator=None, as_of=None):
+    """Newest complete ``run_date=`` partition of ``entity``, on or before ``as_of`` if given."""
+    runs = sorted(p.parent for p in _entity_dir(entity, indicator).glob("run_date=*/_SUCCESS"))
+    if as_of is not None:
+        runs = [p for p in runs if p.name.removeprefix("run_date=") <= as_of]
+    return runs[-1] if runs else None
+
+
+def iter_parts(run_dir):
+    """Records of each part file of a partition, one list per part, in part order."""
+    for path in sorted(run_dir.glob("part-*.ndjson.gz")):
+        with gzip.open(path, "rb") as f:
+            yield [orjson.loads(line) for line in f]
+
+
+def read_latest(entity, indicator=None, as_of=None):
+    """All records of the newest partition, or ``None`` if nothing was landed."""
+    run_dir = latest_run(entity, indicator, as_of)
+    if run_dir is None:
+        return None
+    return [record for part in iter_parts(run_dir) for record in part]
+
+
+def landed_indicators():
+    """Codes of the indicators with landed values, sorted."""
+    return sorted(p.name.removeprefix("indicator=") for p in _entity_dir(VALUES).glob("indicator=*") if p.is_dir())
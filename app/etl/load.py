@@ -1,55 +1,90 @@
+import hashlib
+import io
+import pandas as pd
+from sqlalchemy import String, cast, func
 from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
 from app.db.db import SessionLocal
+from app.db.data_version import bump_data_version
+from app.db.registry import current_registry, registry
+from app.etl.rollups import refresh_country_rollups, refresh_rollups
 from app.models.models import Topic, IndicatorMeta, Country
 from app.utils.logger import logger
-from app.models.models import IndicatorValue
+
+HASH_SEPARATOR = "\x1f"
+HASH_NULL = "\x1e"
+
+# (model, conflict key, columns compared and updated)
+DIMENSIONS = (
+    (Topic, "id", ["name"]),
+    (IndicatorMeta, "code", ["name", "topic_id", "source_note"]),
+    (Country, "iso3", ["name", "region"]),
+)
+
+
+def _row_hash(values):
+    text = HASH_SEPARATOR.join(HASH_NULL if pd.isna(v) else str(v) for v in values)
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def _changed_rows(session, model, key, columns, df):
+    """Rows of ``df`` that are new or whose content hash differs from the stored row."""
+    stored_hash = func.md5(func.concat_ws(
+        HASH_SEPARATOR, *(func.coalesce(cast(getattr(model, c), String), HASH_NULL) for c in columns)
+    ))
+    existing = dict(session.query(getattr(model, key), stored_hash).all())
+
+    rows = []
+    for record in df[[key, *columns]].to_dict("records"):
+        if existing.get(record[key]) == _row_hash(record[c] for c in columns):
+            continue
+        rows.append({k: None if pd.isna(v) else v for k, v in record.items()})
+    return rows
+
+
+def _upsert_batches(session, model, key, columns, rows):
+    for start in range(0, len(rows), settings.DIM_BATCH_SIZE):
+        stmt = insert(model).values(rows[start:start + settings.DIM_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={c: stmt.excluded[c] for c in columns}
+        )
+        session.execute(stmt)
+
+
+def _moved_country_ids(session, rows):
+    """Ids of existing countries whose region differs in ``rows``."""
+    regions = {row["iso3"]: row["region"] for row in rows}
+    stored = session.query(Country.iso3, Country.id, Country.region).filter(Country.iso3.in_(list(regions))).all()
+    return [id_ for iso3, id_, region in stored if region != regions[iso3]]
+
 
 def load_dimensions(topics_df, indicators_df, countries_df):
+    """Upsert the dimension tables in multi-row batches, skipping rows whose content is unchanged.
+
+    Countries that moved to another region get the rollups of their indicators refreshed in the
+    same transaction.
+
+    Returns ``{table name: number of rows written}``.
+    """
     session = SessionLocal()
     try:
-        for row in topics_df.itertuples():
-            stmt = insert(Topic).values(
-                id=row.id,
-                name=row.name
-            ).on_conflict_do_update(
-                index_elements=['id'],
-                set_={'name': row.name}
-            )
-            session.execute(stmt)
-        session.commit()
-        for row in indicators_df.itertuples():
-            stmt = insert(IndicatorMeta).values(
-                code=row.code,
-                name=row.name,
-                topic_id=row.topic_id,
-                source_note=row.source_note
-            ).on_conflict_do_update(
-                index_elements=['code'],
-                set_={
-                    'name': row.name,
-                    'topic_id': row.topic_id,
-                    'source_note': row.source_note
-                }
-            )
-            session.execute(stmt)
-        session.commit()
-
-        for row in countries_df.itertuples():
-            stmt = insert(Country).values(
-                iso3=row.iso3,
-                name=row.name,
-                region=row.region
-            ).on_conflict_do_update(
-                index_elements=['iso3'],
-                set_={
-                    'name': row.name,
-                    'region': row.region
-                }
-            )
-            session.execute(stmt)
-        session.commit()
+        written = {}
+        for df, (model, key, columns) in zip((topics_df, indicators_df, countries_df), DIMENSIONS):
+            rows = _changed_rows(session, model, key, columns, df)
+            moved = _moved_country_ids(session, rows) if model is Country and rows else []
+            _upsert_batches(session, model, key, columns, rows)
+            refresh_country_rollups(session, moved)
+            if rows:
+                bump_data_version(session, dimensions=model is not Topic)
+            session.commit()
+            written[model.__tablename__] = len(rows)
+            logger.info(f"{model.__tablename__}: {len(rows)} of {len(df)} rows new or changed")
 
+        if written[IndicatorMeta.__tablename__] or written[Country.__tablename__]:
+            registry.expire()
         logger.info("Dimensions loaded successfully.")
+        return written
     except Exception as e:
         session.rollback()
         logger.error(f"Error during dimension load: {e}")
@@ -58,47 +93,98 @@ def load_dimensions(topics_df, indicators_df, countries_df):
         session.close()
 
 
+STAGE_VALUES_DDL = """
+    CREATE TEMP TABLE stage_indicator_values (
+        indicator_id integer,
+        country_id integer,
+        date integer,
+        value double precision
+    ) ON COMMIT DROP
+"""
+
+# staged rows; DISTINCT ON keeps the last copy of a duplicated key
+STAGED_VALUES_SQL = """
+    SELECT DISTINCT ON (indicator_id, country_id, date) indicator_id, country_id, date, value
+    FROM stage_indicator_values
+    ORDER BY indicator_id, country_id, date, ctid DESC
+"""
+
+CHANGED_VALUES_SQL = f"""
+    SELECT s.indicator_id, count(*)
+    FROM ({STAGED_VALUES_SQL}) s
+    JOIN indicator_values iv
+      ON iv.indicator_id = s.indicator_id AND iv.country_id = s.country_id AND iv.date = s.date
+    WHERE iv.value IS DISTINCT FROM s.value
+    GROUP BY s.indicator_id
+"""
+
+MERGE_VALUES_SQL = f"""
+    INSERT INTO indicator_values (indicator_id, country_id, date, value)
+    {STAGED_VALUES_SQL}
+    ON CONFLICT (indicator_id, country_id, date) DO UPDATE SET value = EXCLUDED.value
+    WHERE indicator_values.value IS DISTINCT FROM EXCLUDED.value
+"""
+
+
+def resolve_value_ids(values_df, dimensions):
+    """``values_df`` keyed by surrogate ids, mapped column-wise through the registry.
+
+    Rows whose indicator code or iso3 is unknown are dropped, as the old join on the codes did.
+    """
+    resolved = pd.DataFrame({
+        "indicator_id": values_df["indicator_code"].map(dimensions.indicator_ids),
+        "country_id": values_df["iso3"].map(dimensions.country_ids),
+        "date": values_df["date"],
+        "value": values_df["value"],
+    })
+    known = resolved["indicator_id"].notna() & resolved["country_id"].notna()
+    if not known.all():
+        unknown = values_df.loc[~known]
+        logger.warning(
+            f"Skipping {len(unknown)} values with unknown indicator codes or countries "
+            f"(e.g. {unknown['indicator_code'].iloc[0]}/{unknown['iso3'].iloc[0]})"
+        )
+        resolved = resolved[known]
+    return resolved.astype({"indicator_id": "int64", "country_id": "int64"})
+
 
 def load_values(values_df):
+    """Map ``values_df`` to surrogate ids, COPY it into a temp staging table and merge it with one
+    set-based upsert.
+
+    When rows changed, the rollups of the loaded indicators are refreshed and the data version is
+    bumped in the same transaction.
+    Returns the number of rows inserted or changed.
+    """
+    if values_df.empty:
+        return 0
+
     session = SessionLocal()
     try:
-        indicator_map = {ind.code: ind.id for ind in session.query(IndicatorMeta).all()}
-        country_map = {c.iso3: c.id for c in session.query(Country).all()}
-
-        for row in values_df.itertuples():
-            ind_id = indicator_map.get(row.indicator_code)
-            ctry_id = country_map.get(row.iso3)
-            if not ind_id or not ctry_id:
-                continue
-
-            existing = session.query(IndicatorValue).filter_by(
-                indicator_id=ind_id,
-                country_id=ctry_id,
-                date=row.date
-            ).first()
-
-            if existing:
-                if existing.value != row.value:
-                    logger.warning(
-                        f"Overwriting IndicatorValue for indicator_id={ind_id}, country_id={ctry_id}, date={row.date} "
-                        f"from {existing.value} to {row.value}"
-                    )
-                else:
-                    continue
-
-            stmt = insert(IndicatorValue).values(
-                indicator_id=ind_id,
-                country_id=ctry_id,
-                date=row.date,
-                value=row.value
-            ).on_conflict_do_update(
-                index_elements=['indicator_id', 'country_id', 'date'],
-                set_={'value': row.value}
-            )
-
-            session.execute(stmt)
+        dimensions = current_registry(session)
+        resolved = resolve_value_ids(values_df, dimensions)
+        if resolved.empty:
+            return 0
+
+        buffer = io.StringIO()
+        resolved.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        conn = session.connection()
+        conn.exec_driver_sql(STAGE_VALUES_DDL)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert("COPY stage_indicator_values FROM STDIN WITH (FORMAT csv)", buffer)
+
+        for indicator_id, n_changed in conn.exec_driver_sql(CHANGED_VALUES_SQL):
+            code = dimensions.indicator_codes.get(indicator_id, indicator_id)
+            logger.warning(f"Overwriting {n_changed} existing IndicatorValue rows for indicator {code}")
 
+        written = conn.exec_driver_sql(MERGE_VALUES_SQL).rowcount
+        if written:
+            refresh_rollups(session, indicator_ids=resolved["indicator_id"].unique().tolist())
+            bump_data_version(session)
         session.commit()
+        return written
 
     except Exception as e:
         session.rollback()
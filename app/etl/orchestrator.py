@@ -0,0 +1,75 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.etl.runners import run_batch, run_replay, run_streaming
+from app.core.config import settings
+from app.utils.logger import logger, use_worker_log_file
+
+
+def _run_shard(shard, codes, headers, fingerprints, full, mode):
+    if mode == "stream":
+        failed = run_streaming(codes, headers)
+    elif mode == "replay":
+        failed = run_replay(codes)
+    else:
+        failed = run_batch(codes, headers, fingerprints, full)
+    logger.info(f"Shard {shard}: {len(codes) - len(failed)} of {len(codes)} indicators loaded")
+    return failed
+
+
+def _run_attempt(shards, headers, fingerprints, full, mode, workers, attempt):
+    """Run one pass over ``shards``; returns the codes that failed, including those of crashed shards."""
+    def args(n, codes):
+        return (n, codes, {c: headers.get(c) for c in codes}, {c: fingerprints.get(c) for c in codes}, full, mode)
+
+    failed, done = [], 0
+    if workers <= 1:
+        for n, codes in enumerate(shards, 1):
+            try:
+                failed.extend(_run_shard(*args(n, codes)))
+            except Exception as e:
+                logger.error(f"Shard of {len(codes)} indicators crashed: {e}")
+                failed.extend(codes)
+            done += 1
+            logger.info(f"Attempt {attempt}: {done}/{len(shards)} shards done, {len(failed)} indicators failed so far")
+        return failed
+
+    # spawned workers import the app afresh, so each builds its own DB engine and HTTP clients,
+    # and logs to its own file
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=use_worker_log_file) as pool:
+        futures = {pool.submit(_run_shard, *args(n, codes)): codes for n, codes in enumerate(shards, 1)}
+        for future in as_completed(futures):
+            try:
+                failed.extend(future.result())
+            except Exception as e:
+                logger.error(f"Shard of {len(futures[future])} indicators crashed: {e}")
+                failed.extend(futures[future])
+            done += 1
+            logger.info(f"Attempt {attempt}: {done}/{len(shards)} shards done, {len(failed)} indicators failed so far")
+    return failed
+
+
+def run_sharded(codes, headers, fingerprints, full=False, mode="batch", workers=None):
+    """Shard ``codes`` across a pool of worker processes and retry failed indicators.
+
+    The first pass uses shards of ETL_SHARD_SIZE indicators. Failed indicators are retried one per
+    shard, for up to ETL_MAX_ATTEMPTS passes in total. Indicators that still fail keep their previous
+    sync state, so the next incremental run picks them up again. An interrupted run resumes the same
+    way. Returns the codes that failed on every attempt.
+    """
+    workers = workers or settings.ETL_WORKERS
+    shard_size = settings.ETL_SHARD_SIZE
+    pending = list(codes)
+    attempt = 0
+
+    while pending and attempt < settings.ETL_MAX_ATTEMPTS:
+        attempt += 1
+        size = shard_size if attempt == 1 else 1
+        shards = [pending[i:i + size] for i in range(0, len(pending), size)]
+        logger.info(f"Attempt {attempt}: {len(pending)} indicators in {len(shards)} shards across {workers} workers")
+        pending = _run_attempt(shards, headers, fingerprints, full, mode, workers, attempt)
+
+    if pending:
+        logger.error(f"{len(pending)} indicators failed after {attempt} attempts: {', '.join(sorted(pending))}")
+    return pending
@@ -1,47 +1,114 @@
-from app.etl.extract import fetch_indicator_metadata, fetch_indicator_values, fetch_all_countries, fetch_all_topics
-from app.etl.transform import transform_topics, transform_indicators_meta, transform_countries, transform_indicator_values
-from app.etl.load import load_dimensions, load_values
+import os
+import random
+
+if __name__ == "__main__":
+    os.environ["DB_PROFILE"] = "etl"  # before app.db.db builds the engine; run as the ETL whatever the caller set
+
+from app.etl.extract import fetch_indicator_metadata, fetch_all_countries, fetch_all_topics
+from app.etl.async_extract import fetch_many_indicator_headers
+from app.etl.transform import transform_topics, transform_indicators_meta, transform_countries
+from app.etl.landing import DIMENSION_ENTITIES, land, landed_indicators, read_latest
+from app.etl.load import load_dimensions
+from app.etl.orchestrator import run_sharded
+from app.etl.rollups import backfill_rollups
+from app.etl.sync_state import load_sync_states, needs_fetch
 from app.models.models import Base
 from app.db.db import engine
+from app.db.instrumentation import ENGINE_METRICS
+from app.db.migrations import ensure_indexes
 from app.core.config import settings
 from app.utils.logger import logger
 
-def main():
+
+def transform_dimensions(topics_raw, indicators_raw, countries_raw):
+    logger.info("Transforming data...")
+    return transform_topics(topics_raw), transform_indicators_meta(indicators_raw), transform_countries(countries_raw)
+
+
+def extract_dimensions():
+    """Fetch, land and transform topics, indicators and countries; the raw payloads are released on return."""
+    raw = fetch_all_topics(), fetch_indicator_metadata(), fetch_all_countries()
+    for entity, records in zip(DIMENSION_ENTITIES, raw):
+        land(entity, records)
+    return transform_dimensions(*raw)
+
+
+def prepare_database():
     Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    backfill_rollups()
+
+
+def replay(sample=None, random_state=404, workers=None):
+    """Re-run transform and load from the latest landed raw payloads, without touching the network.
+
+    Dimensions are replayed first, then every landed indicator is sharded across ``workers`` processes
+    (default ETL_REPLAY_WORKERS, or one per CPU). The current MIN_YEAR/MAX_YEAR window is applied
+    again, so it can narrow, but not widen, the window the payloads were fetched with.
+    """
+    prepare_database()
+    raw = [read_latest(entity) for entity in DIMENSION_ENTITIES]
+    missing = [entity for entity, records in zip(DIMENSION_ENTITIES, raw) if records is None]
+    if missing:
+        raise RuntimeError(f"Nothing landed for {', '.join(missing)} under {settings.LANDING_DIR}; run the ETL online first")
+
+    logger.info(f"Replaying ETL from {settings.LANDING_DIR}")
+    load_dimensions(*transform_dimensions(*raw))
+
+    codes = landed_indicators()
+    if sample is not None and sample < len(codes):
+        codes = sorted(random.Random(random_state).sample(codes, sample))
+    workers = workers or settings.ETL_REPLAY_WORKERS or os.cpu_count()
+    failed = run_sharded(codes, {}, {}, full=True, mode="replay", workers=workers)
+
+    if failed:
+        logger.warning(f"Replay completed with {len(failed)} failed indicators.")
+    else:
+        logger.info(f"Replay of {len(codes)} indicators completed successfully.")
+    return failed
+
+
+def main(full=False, mode=None, sample=None, random_state=404, workers=None):
+    """Run the ETL. Unless ``full`` is set, indicators whose source watermark is unchanged are skipped.
+
+    ``mode`` is ``"batch"``, ``"stream"`` or ``"replay"`` (see ``replay``) and defaults to
+    ``settings.ETL_MODE``. ``sample`` limits the run to a random sample of that many indicators.
+    ``workers`` sets the number of worker processes the indicators are sharded across (default
+    ``settings.ETL_WORKERS``).
+    """
+    mode = mode or settings.ETL_MODE
+    if mode == "replay":
+        return replay(sample=sample, random_state=random_state, workers=workers)
+    prepare_database()
 
     logger.info("Starting ETL process")
     logger.info("Extracting data...")
-    topics_raw = fetch_all_topics()
-    indicators_raw = fetch_indicator_metadata()
-    countries_raw = fetch_all_countries()
-
     logger.info(f"Data time range: {settings.MIN_YEAR} to {settings.MAX_YEAR}.")
-    logger.info("Transforming data...")
-    topics_df = transform_topics(topics_raw)
-    indicators_df = transform_indicators_meta(indicators_raw)
-    countries_df = transform_countries(countries_raw)
+    topics_df, indicators_df, countries_df = extract_dimensions()
 
-    indicators_df = indicators_df.sample(n=20, random_state=404).copy()
+    if sample is not None and sample < len(indicators_df):
+        indicators_df = indicators_df.sample(n=sample, random_state=random_state).copy()
 
     logger.info("Loading data...")
     load_dimensions(topics_df, indicators_df, countries_df)
 
-    for code in indicators_df["code"]:
-        values_raw = fetch_indicator_values(code)
-
-        if not values_raw:
-            logger.warning(f"No data for indicator: {code}")
-            continue
+    codes = indicators_df["code"].tolist()
+    states = load_sync_states()
+    headers = fetch_many_indicator_headers(codes)
+    if not full:
+        codes = [code for code in codes if needs_fetch(states.get(code), headers.get(code))]
+        logger.info(f"Incremental run: {len(codes)} of {len(indicators_df)} indicators changed at source")
 
-        values_df = transform_indicator_values(values_raw)
+    fingerprints = {code: state.fingerprint for code, state in states.items()}
+    failed = run_sharded(codes, headers, fingerprints, full=full, mode=mode, workers=workers)
 
-        try:
-            load_values(values_df)
-            logger.info(f"Loaded indicator: {code}")
-        except Exception as e:
-            logger.error(f"Failed to load indicator: {code}. Error: {e}")
+    for metrics in ENGINE_METRICS.values():
+        logger.info(f"DB pool stats: {metrics.snapshot()}")
 
-    logger.info("ETL process completed successfully.")
+    if failed:
+        logger.warning(f"ETL process completed with {len(failed)} failed indicators.")
+    else:
+        logger.info("ETL process completed successfully.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,82 @@
+from sqlalchemy import text
+from app.db.db import SessionLocal
+from app.models.models import AGGREGATES_REGION
+from app.utils.logger import logger
+
+# indicators with values that have never been rolled up (e.g. loaded before the rollups existed)
+MISSING_ROLLUPS_SQL = text("""
+    SELECT m.id FROM indicator_meta m
+    WHERE EXISTS (SELECT 1 FROM indicator_values iv WHERE iv.indicator_id = m.id)
+      AND NOT EXISTS (SELECT 1 FROM rollup_indicator_coverage r WHERE r.indicator_id = m.id)
+""")
+
+# indicators whose region rollups group values of the given countries
+COUNTRY_INDICATORS_SQL = text("SELECT DISTINCT indicator_id FROM indicator_values WHERE country_id = ANY(:ids)")
+
+REFRESH_SQL = [text(sql) for sql in (
+    "DELETE FROM rollup_latest_values WHERE indicator_id = ANY(:ids)",
+    """
+    INSERT INTO rollup_latest_values (indicator_id, country_id, date, value)
+    SELECT DISTINCT ON (indicator_id, country_id) indicator_id, country_id, date, value
+    FROM indicator_values
+    WHERE indicator_id = ANY(:ids)
+    ORDER BY indicator_id, country_id, date DESC
+    """,
+    "DELETE FROM rollup_region_year WHERE indicator_id = ANY(:ids)",
+    """
+    INSERT INTO rollup_region_year (indicator_id, region, year, mean, median, min, max, count)
+    SELECT iv.indicator_id, c.region, iv.date, avg(iv.value),
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY iv.value), min(iv.value), max(iv.value), count(*)
+    FROM indicator_values iv
+    JOIN countries c ON c.id = iv.country_id
+    WHERE iv.indicator_id = ANY(:ids) AND c.region IS NOT NULL AND c.region <> :aggregates
+    GROUP BY iv.indicator_id, c.region, iv.date
+    """,
+    "DELETE FROM rollup_indicator_coverage WHERE indicator_id = ANY(:ids)",
+    """
+    INSERT INTO rollup_indicator_coverage (indicator_id, year, countries)
+    SELECT iv.indicator_id, iv.date, count(DISTINCT iv.country_id)
+    FROM indicator_values iv
+    JOIN countries c ON c.id = iv.country_id
+    WHERE iv.indicator_id = ANY(:ids) AND c.region IS DISTINCT FROM :aggregates
+    GROUP BY iv.indicator_id, iv.date
+    """,
+)]
+
+
+def refresh_rollups(session, indicator_ids):
+    """Recompute the rollup tables for the given indicators inside ``session``'s transaction.
+
+    Rows of other indicators are left untouched, so a run only pays for what it loaded.
+    The caller commits.
+    """
+    ids = list(indicator_ids)
+    if not ids:
+        return
+    for stmt in REFRESH_SQL:
+        session.execute(stmt, {"ids": ids, "aggregates": AGGREGATES_REGION})
+
+
+def refresh_country_rollups(session, country_ids):
+    """Recompute the rollups of every indicator with values for ``country_ids``, after their region changed.
+
+    Region-year and coverage rows group countries by region, so moving a country changes them for
+    all of its indicators. The caller flushes the new regions first and commits.
+    """
+    if not country_ids:
+        return
+    ids = session.execute(COUNTRY_INDICATORS_SQL, {"ids": list(country_ids)}).scalars().all()
+    logger.info(f"Refreshing rollups of {len(ids)} indicators for {len(country_ids)} countries with a new region")
+    refresh_rollups(session, ids)
+
+
+def backfill_rollups():
+    session = SessionLocal()
+    try:
+        ids = session.execute(MISSING_ROLLUPS_SQL).scalars().all()
+        if ids:
+            logger.info(f"Backfilling rollups for {len(ids)} indicators")
+            refresh_rollups(session, ids)
+            session.commit()
+    finally:
+        session.close()
@@ -0,0 +1,180 @@
+import queue
+import threading
+from datetime import date
+
+import pandas as pd
+from app.etl.extract import iter_indicator_value_pages
+from app.etl.http_client import HttpClient
+from app.etl.landing import VALUES, complete_run, land, read_latest
+from app.etl.async_extract import iter_indicator_values
+from app.etl.transform import transform_indicator_values
+from app.etl.load import load_values
+from app.etl.sync_state import fingerprint_values, save_sync_state, source_version
+from app.core.config import settings
+from app.utils.logger import logger
+
+_END = object()
+
+
+def run_batch(codes, headers, fingerprints, full=False, loader=load_values, save_state=save_sync_state):
+    """Fetch up to ETL_INDICATOR_CONCURRENCY indicators at a time through one extractor, transforming
+    and loading each one whole as soon as it arrives.
+
+    Returns the codes that failed to fetch or load.
+    """
+    failed = []
+    stats = {}
+    versions = {code: source_version(headers.get(code)) for code in codes}
+    for code, values_raw in iter_indicator_values(codes, stats=stats, versions=versions):
+        if code in stats:
+            s = stats[code]
+            logger.info(
+                f"Fetched {code}: {s.pages} pages, {s.bytes} bytes; "
+                f"saved {s.pages_saved} pages, ~{s.bytes_saved} bytes vs full history"
+            )
+        if values_raw is None:
+            failed.append(code)
+            continue
+        land(VALUES, values_raw, indicator=code)
+        if not values_raw:
+            logger.warning(f"No data for indicator: {code}")
+            save_state(code, headers.get(code), fingerprint_values(pd.DataFrame()))
+            continue
+
+        values_df = transform_indicator_values(values_raw)
+        fingerprint = fingerprint_values(values_df)
+        if not full and fingerprints.get(code) == fingerprint:
+            logger.info(f"Indicator unchanged, skipping load: {code}")
+            save_state(code, headers.get(code), fingerprint)
+            continue
+
+        try:
+            loader(values_df)
+            save_state(code, headers.get(code), fingerprint)
+            logger.info(f"Loaded indicator: {code}")
+        except Exception as e:
+            logger.error(f"Failed to load indicator: {code}. Error: {e}")
+            failed.append(code)
+    return failed
+
+
+def _produce_pages(code_queue, page_queue, headers):
+    # the consumer counts end markers, so one is sent however this thread exits
+    try:
+        with HttpClient() as http:
+            while True:
+                try:
+                    code = code_queue.get_nowait()
+                except queue.Empty:
+                    break
+                run_date = date.today().isoformat()
+                try:
+                    pages = iter_indicator_value_pages(code, http, source_version(headers.get(code)))
+                    for part, records in enumerate(pages):
+                        land(VALUES, records, indicator=code, part=part, complete=False, run_date=run_date)
+                        page_queue.put((code, records))
+                    complete_run(VALUES, code, run_date)
+                    page_queue.put((code, _END))
+                except Exception as e:
+                    logger.error(f"Failed to fetch indicator: {code}. Error: {e}")
+                    page_queue.put((code, None))
+    finally:
+        page_queue.put((None, _END))
+
+
+def run_streaming(codes, headers, loader=load_values, save_state=save_sync_state):
+    """Stream pages from extract through transform into loader batches of about STREAM_BATCH_ROWS rows.
+
+    Producer threads block once STREAM_QUEUE_PAGES raw pages are waiting, so memory is bounded by
+    the queue and batch sizes rather than by indicator size. An indicator's sync state is saved once
+    all of its rows have been flushed. No fingerprint is kept, since no indicator is held whole.
+    Returns the codes that failed to fetch or load.
+    """
+    code_queue = queue.Queue()
+    for code in codes:
+        code_queue.put(code)
+    page_queue = queue.Queue(maxsize=settings.STREAM_QUEUE_PAGES)
+
+    producers = [
+        threading.Thread(target=_produce_pages, args=(code_queue, page_queue, headers), daemon=True)
+        for _ in range(max(1, min(settings.ETL_INDICATOR_CONCURRENCY, len(codes))))
+    ]
+    for producer in producers:
+        producer.start()
+
+    batch, batch_rows, batch_codes = [], 0, set()
+    finished, failed = [], set()
+
+    def flush():
+        nonlocal batch, batch_rows, batch_codes, finished
+        if batch:
+            try:
+                loader(pd.concat(batch, ignore_index=True))
+            except Exception as e:
+                logger.error(f"Failed to load batch for indicators {sorted(batch_codes)}. Error: {e}")
+                failed.update(batch_codes)
+        for code in finished:
+            if code not in failed:
+                save_state(code, headers.get(code), None)
+                logger.info(f"Loaded indicator: {code}")
+        batch, batch_rows, batch_codes, finished = [], 0, set(), []
+
+    running = len(producers)
+    while running:
+        code, records = page_queue.get()
+        if code is None:
+            running -= 1
+        elif records is _END:
+            finished.append(code)
+        elif records is None:
+            failed.add(code)
+        else:
+            frame = transform_indicator_values(records)
+            if not frame.empty:
+                batch.append(frame)
+                batch_rows += len(frame)
+                batch_codes.add(code)
+            if batch_rows >= settings.STREAM_BATCH_ROWS:
+                flush()
+    flush()
+
+    for producer in producers:
+        producer.join()
+    return sorted(failed)
+
+
+def run_replay(codes, loader=load_values):
+    """Transform and load ``codes`` from their latest landed raw values, without the network.
+
+    Indicators are loaded in batches of about STREAM_BATCH_ROWS rows. Sync state is left alone, since
+    the source was not consulted. Returns the codes with nothing landed or that failed to load.
+    """
+    failed = []
+    batch, batch_rows, batch_codes = [], 0, []
+
+    def flush():
+        nonlocal batch, batch_rows, batch_codes
+        if batch:
+            try:
+                loader(pd.concat(batch, ignore_index=True))
+                logger.info(f"Replayed {len(batch_codes)} indicators, {batch_rows} rows")
+            except Exception as e:
+                logger.error(f"Failed to load replayed indicators {batch_codes}. Error: {e}")
+                failed.extend(batch_codes)
+        batch, batch_rows, batch_codes = [], 0, []
+
+    for code in codes:
+        values_raw = read_latest(VALUES, code)
+        if values_raw is None:
+            logger.warning(f"No landed values for indicator: {code}")
+            failed.append(code)
+            continue
+        frame = transform_indicator_values(values_raw)
+        if not frame.empty:
+            batch.append(frame)
+            batch_rows += len(frame)
+        batch_codes.append(code)
+        if batch_rows >= settings.STREAM_BATCH_ROWS:
+            flush()
+    flush()
+    return failed
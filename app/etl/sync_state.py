@@ -0,0 +1,64 @@
+import hashlib
+import math
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.db import SessionLocal
+from app.models.models import IndicatorSyncState
+
+
+def load_sync_states():
+    session = SessionLocal()
+    try:
+        return {s.indicator_code: s for s in session.query(IndicatorSyncState).all()}
+    finally:
+        session.close()
+
+
+def needs_fetch(state, header):
+    """True unless the source reports the same ``lastupdated`` and ``total`` as the stored watermark."""
+    if state is None or header is None:
+        return True
+    return not (state.last_updated == header.get("lastupdated") and state.total == header.get("total"))
+
+
+def source_version(header):
+    """The watermark ``needs_fetch`` compares, as one string; cached value pages are keyed on it."""
+    if header is None:
+        return None
+    return f"{header.get('lastupdated')}/{header.get('total')}"
+
+
+def fingerprint_values(values_df):
+    if values_df.empty:
+        return hashlib.md5(b"").hexdigest()
+    ordered = values_df.sort_values(["indicator_code", "iso3", "date"])[["indicator_code", "iso3", "date", "value"]]
+    ordered = ordered.astype({"date": "int64", "value": "float64"})
+    return hashlib.md5(pd.util.hash_pandas_object(ordered, index=False).values.tobytes()).hexdigest()
+
+
+def save_sync_state(indicator_code, header, fingerprint):
+    header = header or {}
+    total = header.get("total")
+    row = {
+        "indicator_code": indicator_code,
+        "last_run_at": datetime.now(),
+        "last_updated": header.get("lastupdated"),
+        "pages": math.ceil(total / settings.WB_PER_PAGE) if total is not None else None,
+        "total": total,
+        "fingerprint": fingerprint,
+    }
+    session = SessionLocal()
+    try:
+        stmt = insert(IndicatorSyncState).values(row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["indicator_code"],
+            set_={k: v for k, v in row.items() if k != "indicator_code"}
+        )
+        session.execute(stmt)
+        session.commit()
+    finally:
+        session.close()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from app.core.config import settings
 from app.utils.logger import logger
@@ -32,25 +33,50 @@ def transform_countries(countries_raw):
     df.drop_duplicates(subset=["iso3"], inplace=True)
     return df
 
-def transform_indicator_values(values_raw):
-    rows = []
-    for d in values_raw:
-        date_str = d["date"]
+def _parse_years(dates):
+    """int64 years and a parsed mask from a unicode array, accepting what ``int()`` accepts.
+
+    Four ASCII-digit years, nearly every record, are decoded straight from the code points;
+    the rest go through ``int()`` one by one.
+    """
+    dates = np.char.strip(dates)
+    years = np.zeros(len(dates), dtype=np.int64)
+    parsed = np.zeros(len(dates), dtype=bool)
+    width = dates.dtype.itemsize // 4
+    if width >= 4:
+        raw = dates.view(np.uint32).reshape(len(dates), width)[:, :4].astype(np.int64) - ord("0")
+        parsed = (np.char.str_len(dates) == 4) & ((raw >= 0) & (raw <= 9)).all(axis=1)
+        years[parsed] = raw[parsed] @ np.array([1000, 100, 10, 1])
+    for i in np.flatnonzero(~parsed):
         try:
-            year = int(date_str)
-        except ValueError:
+            years[i] = int(dates[i])
+        except (ValueError, OverflowError):
             continue
+        parsed[i] = True
+    return years, parsed
 
-        if d.get("value") is None:
-            continue
-        if year < settings.MIN_YEAR or year > settings.MAX_YEAR:
-            continue
-        rows.append({
-            "indicator_code": d["indicator"]["id"],
-            "iso3": d["countryiso3code"],
-            "date": year,
-            "value": float(d["value"])
+def transform_indicator_values(values_raw):
+    """Columnar parse of raw value records into ``indicator_code, iso3, date (int16), value (float64)``.
+
+    Records with a non-numeric date, a null value or a year outside MIN_YEAR..MAX_YEAR are dropped.
+    """
+    if not values_raw:
+        return pd.DataFrame({
+            "indicator_code": pd.Series(dtype=object),
+            "iso3": pd.Series(dtype=object),
+            "date": pd.Series(dtype=np.int16),
+            "value": pd.Series(dtype=np.float64),
         })
 
-    df = pd.DataFrame(rows)
-    return df
+    values = np.array([d.get("value") for d in values_raw], dtype=np.float64)  # None -> NaN
+    years, parsed = _parse_years(np.array([d["date"] for d in values_raw], dtype="U"))
+    keep = np.flatnonzero(
+        parsed & ~np.isnan(values) & (years >= settings.MIN_YEAR) & (years <= settings.MAX_YEAR)
+    ).tolist()
+
+    return pd.DataFrame({
+        "indicator_code": [values_raw[i]["indicator"]["id"] for i in keep],
+        "iso3": [values_raw[i]["countryiso3code"] for i in keep],
+        "date": years[keep].astype(np.int16),
+        "value": values[keep],
+    })
@@ -0,0 +1,161 @@
+import zlib
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.db import SessionLocal
+from app.models.models import Country, IndicatorMeta, IndicatorValue
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "csv": ("application/gzip", "csv.gz"),
+}
+
+LONG_COLUMNS = ["indicator_code", "iso3", "year", "value"]
+CODE = pa.dictionary(pa.int32(), pa.string())
+
+
+def values_query(indicator_ids=None, topic_id=None, country_ids=None, year_min=None, year_max=None):
+    """Long-layout rows in (indicator, country, year) order, the order of the indicator_values unique index."""
+    query = (
+        select(IndicatorMeta.code.label("indicator_code"), Country.iso3, IndicatorValue.date.label("year"), IndicatorValue.value)
+        .join(IndicatorMeta, IndicatorMeta.id == IndicatorValue.indicator_id)
+        .join(Country, Country.id == IndicatorValue.country_id)
+        .order_by(IndicatorValue.indicator_id, IndicatorValue.country_id, IndicatorValue.date)
+    )
+    if indicator_ids:
+        query = query.where(IndicatorValue.indicator_id.in_(indicator_ids))
+    if topic_id is not None:
+        query = query.where(IndicatorMeta.topic_id == topic_id)
+    if country_ids:
+        query = query.where(IndicatorValue.country_id.in_(country_ids))
+    if year_min is not None:
+        query = query.where(IndicatorValue.date >= year_min)
+    if year_max is not None:
+        query = query.where(IndicatorValue.date <= year_max)
+    return query
+
+
+def iter_long_chunks(query, chunk_rows):
+    """DataFrames of at most ``chunk_rows`` rows, read through a server-side cursor."""
+    session = SessionLocal()
+    try:
+        result = session.execute(query.execution_options(stream_results=True, yield_per=chunk_rows))
+        for rows in result.partitions():
+            yield pd.DataFrame(rows, columns=LONG_COLUMNS)
+    finally:
+        session.close()
+
+
+def iter_wide_chunks(long_chunks, years):
+    """Pivot long chunks to one row per (indicator, country) with a column per year.
+
+    Rows arrive grouped by (indicator, country), so only the last, possibly incomplete
+    group of a chunk is carried over into the next one.
+    """
+    carry = None
+    for chunk in long_chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        last = (chunk["indicator_code"] == chunk["indicator_code"].iat[-1]) & (chunk["iso3"] == chunk["iso3"].iat[-1])
+        carry = chunk[last]
+        if not last.all():
+            yield _pivot(chunk[~last], years)
+    if carry is not None and not carry.empty:
+        yield _pivot(carry, years)
+
+
+def _pivot(chunk, years):
+    wide = chunk.pivot(index=["indicator_code", "iso3"], columns="year", values="value").reindex(columns=years)
+    wide.columns = [str(year) for year in years]
+    return wide.reset_index()
+
+
+def arrow_schema(wide, years):
+    if wide:
+        return pa.schema([("indicator_code", CODE), ("iso3", CODE)] + [(str(year), pa.float64()) for year in years])
+    return pa.schema([("indicator_code", CODE), ("iso3", CODE), ("year", pa.int16()), ("value", pa.float64())])
+
+
+class _Drain:
+    """Write-only file object whose buffered bytes are taken out after each chunk."""
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _encode_arrow(chunks, schema, parquet):
+    sink = _Drain()
+    if parquet:
+        writer = pq.ParquetWriter(sink, schema, use_dictionary=["indicator_code", "iso3"], compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    for chunk in chunks:
+        # each chunk becomes its own Parquet row group / IPC record batch
+        writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def _encode_csv(chunks, columns):
+    gzip = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    yield gzip.compress((",".join(columns) + "\n").encode())
+    for chunk in chunks:
+        yield gzip.compress(chunk.to_csv(index=False, header=False).encode())
+    yield gzip.flush()
+
+
+def export_values(fmt, indicator_ids=None, topic_id=None, country_ids=None, year_min=None, year_max=None,
+                  wide=False, chunk_rows=None):
+    """Yield an export file in ``fmt`` (parquet, arrow or csv) piece by piece.
+
+    Only one chunk of ``chunk_rows`` rows (default ``EXPORT_CHUNK_ROWS``) is held in memory at a time,
+    whatever the export size. ``wide`` gives one row per indicator and country with a column per year.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    year_min = settings.MIN_YEAR if year_min is None else year_min
+    year_max = settings.MAX_YEAR if year_max is None else year_max
+    query = values_query(indicator_ids, topic_id, country_ids, year_min, year_max)
+    chunks = iter_long_chunks(query, chunk_rows or settings.EXPORT_CHUNK_ROWS)
+    years = None
+    if wide:
+        # one column per year, so only the wide layout needs the year list
+        years = list(range(year_min, year_max + 1))
+        chunks = iter_wide_chunks(chunks, years)
+
+    schema = arrow_schema(wide, years)
+    if fmt == "csv":
+        return _encode_csv(chunks, schema.names)
+    return _encode_arrow(chunks, schema, parquet=fmt == "parquet")
+
+
+def write_export(path, fmt, **kwargs):
+    """Write an export to ``path``; returns the number of bytes written."""
+    written = 0
+    with open(path, "wb") as f:
+        for data in export_values(fmt, **kwargs):
+            f.write(data)
+            written += len(data)
+    return written
@@ -1,9 +1,18 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, UniqueConstraint
+from functools import reduce
+from sqlalchemy import (
+    create_engine, Column, DDL, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint, event, func, text
+)
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 from app.core.config import settings
 
 Base = declarative_base()
 
+# trigram operator classes for the search indexes
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
+# World Bank region of the regional/income aggregates ("World", "High income", ...)
+AGGREGATES_REGION = "Aggregates"
+
 class Topic(Base):
     __tablename__ = 'topics'
     id = Column(Integer, primary_key=True)
@@ -15,10 +24,27 @@ class IndicatorMeta(Base):
     id = Column(Integer, primary_key=True)
     code = Column(String, unique=True, nullable=False)
     name = Column(String, nullable=False)
-    topic_id = Column(Integer, ForeignKey('topics.id'))
+    topic_id = Column(Integer, ForeignKey('topics.id'), index=True)
     source_note = Column(String, nullable=True)
     topic = relationship('Topic', back_populates='indicators_meta')
     values = relationship('IndicatorValue', back_populates='indicator_meta')
+    __table_args__ = (
+        Index('ix_indicator_meta_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_indicator_meta_code_trgm', 'code', postgresql_using='gin', postgresql_ops={'code': 'gin_trgm_ops'}),
+    )
+
+
+def search_document(*columns):
+    """English tsvector over ``columns``. Only literals, no bind parameters, so queries match the index expression."""
+    document = reduce(
+        lambda a, b: a.op('||')(text("' '")).op('||')(b),
+        [func.coalesce(c, text("''")) for c in columns]
+    )
+    return func.to_tsvector(text("'english'::regconfig"), document)
+
+
+INDICATOR_SEARCH_DOCUMENT = search_document(IndicatorMeta.name, IndicatorMeta.code, IndicatorMeta.source_note)
+Index('ix_indicator_meta_search', INDICATOR_SEARCH_DOCUMENT, postgresql_using='gin').ddl_if(dialect='postgresql')
 
 class Country(Base):
     __tablename__ = 'countries'
@@ -27,6 +53,9 @@ class Country(Base):
     name = Column(String, nullable=False)
     region = Column(String, nullable=True)
     indicator_values = relationship('IndicatorValue', back_populates='country')
+    __table_args__ = (
+        Index('ix_countries_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
 class IndicatorValue(Base):
     __tablename__ = 'indicator_values'
@@ -37,7 +66,13 @@ class IndicatorValue(Base):
     value = Column(Float, nullable=False)
     indicator_meta = relationship('IndicatorMeta', back_populates='values')
     country = relationship('Country', back_populates='indicator_values')
-    __table_args__ = (UniqueConstraint('indicator_id', 'country_id', 'date', name='uix_indicator_country_date'),)
+    __table_args__ = (
+        # covering: index-only scans for indicator/country/date-range reads such as the dashboard's
+        UniqueConstraint('indicator_id', 'country_id', 'date', name='uix_indicator_country_date',
+                         postgresql_include=['value']),
+        # country-first: /indicator-values?country_id=... without an indicator
+        Index('ix_indicator_values_country_indicator_date', 'country_id', 'indicator_id', 'date'),
+    )
 
 
 class ETLLog(Base):
@@ -46,4 +81,53 @@ class ETLLog(Base):
     id = Column(Integer, primary_key=True)
     level = Column(String, nullable=False)
     message = Column(String, nullable=False)
-    timestamp = Column(String, nullable=False)
+    timestamp = Column(String, nullable=False, index=True)
+
+
+class IndicatorSyncState(Base):
+    __tablename__ = "indicator_sync_state"
+
+    indicator_code = Column(String, primary_key=True)
+    last_run_at = Column(DateTime, nullable=False)
+    last_updated = Column(String, nullable=True)
+    pages = Column(Integer, nullable=True)
+    total = Column(Integer, nullable=True)
+    fingerprint = Column(String(32), nullable=True)
+
+
+class LatestValue(Base):
+    __tablename__ = "rollup_latest_values"
+
+    indicator_id = Column(Integer, ForeignKey('indicator_meta.id', ondelete='CASCADE'), primary_key=True)
+    country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'), primary_key=True)
+    date = Column(Integer, nullable=False)
+    value = Column(Float, nullable=False)
+
+
+class RegionYearRollup(Base):
+    __tablename__ = "rollup_region_year"
+
+    indicator_id = Column(Integer, ForeignKey('indicator_meta.id', ondelete='CASCADE'), primary_key=True)
+    region = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    mean = Column(Float, nullable=False)
+    median = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+    count = Column(Integer, nullable=False)
+
+
+class CoverageRollup(Base):
+    __tablename__ = "rollup_indicator_coverage"
+
+    indicator_id = Column(Integer, ForeignKey('indicator_meta.id', ondelete='CASCADE'), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    countries = Column(Integer, nullable=False)
+
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
@@ -0,0 +1,217 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal
+
+from app.core.config import settings
+from app.schemas.aggregates import CoveragePoint, GrowthPoint, LatestPoint, RankedValue, RegionYearAggregate
+from app.models.models import (
+    AGGREGATES_REGION, Country, CoverageRollup, IndicatorValue, LatestValue, RegionYearRollup
+)
+from app.db.async_db import get_async_db
+from app.utils.logger import logger
+from app.utils.resolve import resolve_countries, resolve_indicators
+
+router = APIRouter(tags=["Aggregates"])
+
+
+async def _indicator_id(db: AsyncSession, indicator: str):
+    return (await resolve_indicators(db, [indicator]))[0].id
+
+
+def _check_years(year_min, year_max):
+    if year_min > year_max:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="year_min must not exceed year_max")
+
+
+def _country_values(indicator_id, year_min, year_max, include_aggregates):
+    query = (
+        select(IndicatorValue.country_id, IndicatorValue.date, IndicatorValue.value)
+        .where(IndicatorValue.indicator_id == indicator_id)
+        .where(IndicatorValue.date >= year_min, IndicatorValue.date <= year_max)
+    )
+    if not include_aggregates:
+        query = query.join(Country, Country.id == IndicatorValue.country_id).where(
+            Country.region.is_distinct_from(AGGREGATES_REGION)
+        )
+    return query
+
+
+def growth_query(indicator_id, country_ids, year_min, year_max):
+    """Each country's values with the year-over-year % change against the previous year's value."""
+    # start one year early so the first requested year has a predecessor
+    values = _country_values(indicator_id, year_min - 1, year_max, include_aggregates=True)
+    if country_ids:
+        values = values.where(IndicatorValue.country_id.in_(country_ids))
+    window = {"partition_by": IndicatorValue.country_id, "order_by": IndicatorValue.date}
+    lagged = values.add_columns(
+        func.lag(IndicatorValue.value).over(**window).label("prev_value"),
+        func.lag(IndicatorValue.date).over(**window).label("prev_year"),
+    ).subquery()
+
+    yoy = case(
+        (and_(lagged.c.prev_year == lagged.c.date - 1, lagged.c.prev_value != 0),
+         (lagged.c.value - lagged.c.prev_value) / func.abs(lagged.c.prev_value) * 100),
+        else_=None,
+    )
+    return (
+        select(Country.iso3, lagged.c.date.label("year"), lagged.c.value, yoy.label("yoy_pct"))
+        .join(Country, Country.id == lagged.c.country_id)
+        .where(lagged.c.date >= year_min)
+        .order_by(Country.iso3, lagged.c.date)
+    )
+
+
+def top_query(indicator_id, year_min, year_max, n, order, include_aggregates):
+    """The ``n`` highest (or lowest) ranked countries per year; ties share a rank."""
+    ordering = IndicatorValue.value.desc() if order == "desc" else IndicatorValue.value.asc()
+    ranked = _country_values(indicator_id, year_min, year_max, include_aggregates).add_columns(
+        func.rank().over(partition_by=IndicatorValue.date, order_by=ordering).label("rank")
+    ).subquery()
+    return (
+        select(ranked.c.date.label("year"), ranked.c.rank, Country.iso3, Country.name.label("country"), ranked.c.value)
+        .join(Country, Country.id == ranked.c.country_id)
+        .where(ranked.c.rank <= n)
+        .order_by(ranked.c.date, ranked.c.rank, Country.iso3)
+    )
+
+
+def coverage_query(indicator_id, year_min, year_max):
+    """Countries reporting per year, aggregates included; the rollup only counts countries."""
+    values = _country_values(indicator_id, year_min, year_max, include_aggregates=True).subquery()
+    return (
+        select(values.c.date.label("year"), func.count(func.distinct(values.c.country_id)).label("countries"))
+        .group_by(values.c.date)
+        .order_by(values.c.date)
+    )
+
+
+@router.get("/regions", response_model=List[RegionYearAggregate])
+async def get_region_aggregates(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: str = Query(..., description="Indicator id or code"),
+        year_min: int = Query(settings.MIN_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: int = Query(settings.MAX_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX)
+):
+    """Per region and year statistics of the countries' values, read from the region-year rollup."""
+    logger.info(f"GET /aggregates/regions called with indicator={indicator}, years={year_min}-{year_max}")
+    _check_years(year_min, year_max)
+    indicator_id = await _indicator_id(db, indicator)
+
+    query = (
+        select(
+            RegionYearRollup.region, RegionYearRollup.year, RegionYearRollup.mean, RegionYearRollup.median,
+            RegionYearRollup.min, RegionYearRollup.max, RegionYearRollup.count,
+        )
+        .where(RegionYearRollup.indicator_id == indicator_id)
+        .where(RegionYearRollup.year >= year_min, RegionYearRollup.year <= year_max)
+        .order_by(RegionYearRollup.region, RegionYearRollup.year)
+    )
+    rows = (await db.execute(query)).mappings().all()
+    logger.info(f"Returning {len(rows)} region-year aggregates")
+    return rows
+
+
+@router.get("/growth", response_model=List[GrowthPoint])
+async def get_growth(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: str = Query(..., description="Indicator id or code"),
+        country: List[str] = Query([], description="Country ids or ISO3 codes; omit for all countries"),
+        year_min: int = Query(settings.MIN_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: int = Query(settings.MAX_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX)
+):
+    """Year-over-year % change per country; null when the previous year is missing or zero."""
+    logger.info(f"GET /aggregates/growth called with indicator={indicator}, country={country}, years={year_min}-{year_max}")
+    _check_years(year_min, year_max)
+    indicator_id = await _indicator_id(db, indicator)
+
+    country_ids = [c.id for c in await resolve_countries(db, country)] if country else None
+    query = growth_query(indicator_id, country_ids, year_min, year_max)
+    rows = (await db.execute(query)).mappings().all()
+    logger.info(f"Returning {len(rows)} growth points")
+    return rows
+
+
+@router.get("/top", response_model=List[RankedValue])
+async def get_top_countries(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: str = Query(..., description="Indicator id or code"),
+        year_min: int = Query(settings.MIN_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: int = Query(settings.MAX_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        n: int = Query(10, ge=1, le=100),
+        order: Literal["desc", "asc"] = Query("desc"),
+        include_aggregates: bool = Query(False, description="Rank regional/income aggregates alongside countries")
+):
+    logger.info(f"GET /aggregates/top called with indicator={indicator}, years={year_min}-{year_max}, n={n}, order={order}")
+    _check_years(year_min, year_max)
+    indicator_id = await _indicator_id(db, indicator)
+
+    query = top_query(indicator_id, year_min, year_max, n, order, include_aggregates)
+    rows = (await db.execute(query)).mappings().all()
+    logger.info(f"Returning {len(rows)} ranked values")
+    return rows
+
+
+@router.get("/coverage", response_model=List[CoveragePoint])
+async def get_coverage(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: str = Query(..., description="Indicator id or code"),
+        year_min: int = Query(settings.MIN_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: int = Query(settings.MAX_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        include_aggregates: bool = Query(False, description="Count regional/income aggregates as countries")
+):
+    """Countries reporting a value per year, against the number of countries known.
+
+    Served from the coverage rollup unless aggregates are counted.
+    """
+    logger.info(f"GET /aggregates/coverage called with indicator={indicator}, years={year_min}-{year_max}")
+    _check_years(year_min, year_max)
+    indicator_id = await _indicator_id(db, indicator)
+
+    total = select(func.count()).select_from(Country)
+    if not include_aggregates:
+        total = total.where(Country.region.is_distinct_from(AGGREGATES_REGION))
+    total_countries = (await db.execute(total)).scalar()
+
+    if include_aggregates:
+        query = coverage_query(indicator_id, year_min, year_max)
+    else:
+        query = (
+            select(CoverageRollup.year, CoverageRollup.countries)
+            .where(CoverageRollup.indicator_id == indicator_id)
+            .where(CoverageRollup.year >= year_min, CoverageRollup.year <= year_max)
+            .order_by(CoverageRollup.year)
+        )
+    rows = [
+        CoveragePoint(year=r.year, countries=r.countries, total_countries=total_countries,
+                      share=r.countries / total_countries if total_countries else 0.0)
+        for r in await db.execute(query)
+    ]
+    logger.info(f"Returning coverage for {len(rows)} years")
+    return rows
+
+
+@router.get("/latest", response_model=List[LatestPoint])
+async def get_latest_values(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: str = Query(..., description="Indicator id or code"),
+        country: List[str] = Query([], description="Country ids or ISO3 codes; omit for all countries"),
+        include_aggregates: bool = Query(False, description="Include regional/income aggregates")
+):
+    """Most recent value per country, whatever year it was reported in."""
+    logger.info(f"GET /aggregates/latest called with indicator={indicator}, country={country}")
+    indicator_id = await _indicator_id(db, indicator)
+
+    query = (
+        select(Country.iso3, Country.name.label("country"), LatestValue.date.label("year"), LatestValue.value)
+        .join(Country, Country.id == LatestValue.country_id)
+        .where(LatestValue.indicator_id == indicator_id)
+        .order_by(Country.iso3)
+    )
+    if country:
+        query = query.where(LatestValue.country_id.in_([c.id for c in await resolve_countries(db, country)]))
+    if not include_aggregates:
+        query = query.where(Country.region.is_distinct_from(AGGREGATES_REGION))
+    rows = (await db.execute(query)).mappings().all()
+    logger.info(f"Returning {len(rows)} latest values")
+    return rows
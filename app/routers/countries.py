@@ -1,37 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.schemas.countries import CountryCreate, CountryOut, CountryUpdate
 from app.models.models import Country
 from app.db.db import get_db
+from app.db.async_db import get_async_db
+from app.db.data_version import bump_data_version
+from app.etl.rollups import refresh_country_rollups
+from app.utils.pagination import CURSOR_DESCRIPTION, paginate
 from app.utils.logger import logger   
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/countries", tags=["Countries"])
 
 @router.get("/", response_model=List[CountryOut])
-def get_countries(
-        db: Session = Depends(get_db),
+async def get_countries(
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         page: int = Query(1, ge=1),
         limit: int = Query(10, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
         search: str = Query("", description="Search countries by name or ISO3")
 ):
-    logger.info(f"GET /countries called with page={page}, limit={limit}, search='{search}'")
-    query = db.query(Country)
+    logger.info(f"GET /countries called with page={page}, limit={limit}, cursor={cursor}, search='{search}'")
+    query = select(Country)
     if search:
-        query = query.filter(
+        query = query.where(
             (Country.name.ilike(f"%{search}%")) |
             (Country.iso3.ilike(f"%{search}%"))
         )
-    countries = query.offset((page - 1) * limit).limit(limit).all()
+    countries = await paginate(db, query, [Country.id], page, limit, cursor, response)
     logger.info(f"Returning {len(countries)} countries")
     return countries
 
 @router.get("/{country_id}", response_model=CountryOut)
-def get_country(country_id: int, db: Session = Depends(get_db)):
+async def get_country(country_id: int, db: AsyncSession = Depends(get_async_db)):
     logger.info(f"GET /countries/{country_id} called")
-    country = db.query(Country).filter(Country.id == country_id).first()
+    country = await db.get(Country, country_id)
     if not country:
         logger.warning(f"Country with id={country_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Country not found")
@@ -44,6 +52,7 @@ def create_country(country_in: CountryCreate, db: Session = Depends(get_db)):
     country = Country(iso3=country_in.iso3, name=country_in.name, region=country_in.region)
     db.add(country)
     try:
+        bump_data_version(db, dimensions=True)
         db.commit()
         db.refresh(country)
     except IntegrityError:
@@ -63,10 +72,15 @@ def update_country(country_id: int, country_in: CountryUpdate, db: Session = Dep
     if country_in.name is not None:
         logger.info(f"Updating name to {country_in.name}")
         country.name = country_in.name
+    region_changed = country_in.region is not None and country_in.region != country.region
     if country_in.region is not None:
         logger.info(f"Updating region to {country_in.region}")
         country.region = country_in.region
 
+    if region_changed:
+        db.flush()
+        refresh_country_rollups(db, [country.id])
+    bump_data_version(db, dimensions=True)
     db.commit()
     db.refresh(country)
     logger.info(f"Country with id={country_id} updated successfully")
@@ -80,6 +94,7 @@ def delete_country(country_id: int, db: Session = Depends(get_db)):
         logger.warning(f"Country with id={country_id} not found for deletion")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Country not found")
     db.delete(country)
+    bump_data_version(db, dimensions=True)
     db.commit()
     logger.info(f"Country with id={country_id} deleted successfully")
     return None
\ No newline at end of file
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+
+from app.core.config import settings
+from app.db.async_db import get_async_db
+from app.export.export import FORMATS, export_values
+from app.utils.logger import logger
+from app.utils.resolve import resolve_countries, resolve_indicators
+
+router = APIRouter(tags=["Exports"])
+
+
+@router.get("/indicator-values")
+async def export_indicator_values(
+        db: AsyncSession = Depends(get_async_db),
+        format: Literal["parquet", "arrow", "csv"] = Query("parquet", description="Parquet, Arrow IPC stream or gzip CSV"),
+        indicator: List[str] = Query([], description="Indicator ids or codes"),
+        topic: Optional[int] = Query(None, description="Topic id; exports every indicator of the topic"),
+        country: List[str] = Query([], description="Country ids or ISO3 codes; omit for all countries"),
+        year_min: int = Query(settings.MIN_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: int = Query(settings.MAX_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        wide: bool = Query(False, description="One row per indicator and country, one column per year")
+):
+    """Indicator values as a file, streamed from the database in chunks."""
+    logger.info(
+        f"GET /exports/indicator-values called: format={format}, indicator={indicator}, topic={topic}, "
+        f"country={country}, years={year_min}-{year_max}, wide={wide}"
+    )
+    indicator_ids = [i.id for i in await resolve_indicators(db, indicator)] if indicator else None
+    country_ids = [c.id for c in await resolve_countries(db, country)] if country else None
+
+    media_type, extension = FORMATS[format]
+    filename = f"indicator_values{'_wide' if wide else ''}.{extension}"
+    return StreamingResponse(
+        export_values(format, indicator_ids, topic, country_ids, year_min, year_max, wide),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
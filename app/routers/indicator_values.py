@@ -1,40 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.schemas.indicator_values import IndicatorValueCreate, IndicatorValueOut, IndicatorValueUpdate
+from typing import List, Literal, Optional
+from app.core.config import settings
+from app.schemas.indicator_values import (
+    BulkRowError, BulkWriteResult, IndicatorValueBulkRow, IndicatorValueCreate, IndicatorValueOut, IndicatorValueUpdate
+)
 from app.models.models import IndicatorValue
 from app.db.db import get_db
+from app.db.async_db import get_async_db
+from app.db.data_version import bump_data_version
+from app.db.registry import current_registry_async
+from app.etl.rollups import refresh_rollups
+from app.utils.pagination import CURSOR_DESCRIPTION, paginate
+from app.utils.resolve import resolve_countries, resolve_indicators
+from app.utils.streaming import MEDIA_TYPES, stream_rows
 from app.utils.logger import logger  
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/indicator-values", tags=["IndicatorValues"])
 
 @router.get("/", response_model=List[IndicatorValueOut])
-def get_indicator_values(
-        db: Session = Depends(get_db),
+async def get_indicator_values(
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         page: int = Query(1, ge=1),
         limit: int = Query(10, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
         indicator_id: Optional[int] = Query(None),
         country_id: Optional[int] = Query(None)
 ):
     logger.info(
-        f"GET /indicator-values called: page={page}, limit={limit}, "
+        f"GET /indicator-values called: page={page}, limit={limit}, cursor={cursor}, "
         f"indicator_id={indicator_id}, country_id={country_id}"
     )
-    query = db.query(IndicatorValue)
+    query = select(IndicatorValue)
     if indicator_id:
-        query = query.filter(IndicatorValue.indicator_id == indicator_id)
+        query = query.where(IndicatorValue.indicator_id == indicator_id)
     if country_id:
-        query = query.filter(IndicatorValue.country_id == country_id)
+        query = query.where(IndicatorValue.country_id == country_id)
     
-    indicator_values = query.offset((page - 1) * limit).limit(limit).all()
+    order_by = [IndicatorValue.indicator_id, IndicatorValue.country_id, IndicatorValue.date]
+    indicator_values = await paginate(db, query, order_by, page, limit, cursor, response)
     logger.info(f"Returning {len(indicator_values)} indicator values")
     return indicator_values
 
+def stream_query(indicator_ids=None, country_ids=None, year_min=None, year_max=None):
+    """Plain value columns in the order of the indicator_values unique index."""
+    query = select(
+        IndicatorValue.id, IndicatorValue.indicator_id, IndicatorValue.country_id, IndicatorValue.date, IndicatorValue.value
+    )
+    if indicator_ids:
+        query = query.where(IndicatorValue.indicator_id.in_(indicator_ids))
+    if country_ids:
+        query = query.where(IndicatorValue.country_id.in_(country_ids))
+    if year_min is not None:
+        query = query.where(IndicatorValue.date >= year_min)
+    if year_max is not None:
+        query = query.where(IndicatorValue.date <= year_max)
+    return query.order_by(IndicatorValue.indicator_id, IndicatorValue.country_id, IndicatorValue.date)
+
+
+_VALUE_SCHEMA = {"$ref": "#/components/schemas/IndicatorValueOut"}
+
+
+@router.get("/stream", response_class=StreamingResponse, responses={200: {
+    "description": "One IndicatorValueOut per line (ndjson) or a JSON array of them (json)",
+    "content": {
+        MEDIA_TYPES["ndjson"]: {"schema": _VALUE_SCHEMA},
+        MEDIA_TYPES["json"]: {"schema": {"type": "array", "items": _VALUE_SCHEMA}},
+    },
+}})
+async def stream_indicator_values(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: List[str] = Query([], description="Indicator ids or codes; omit for all indicators"),
+        country: List[str] = Query([], description="Country ids or ISO3 codes; omit for all countries"),
+        year_min: Optional[int] = Query(None, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: Optional[int] = Query(None, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        format: Literal["ndjson", "json"] = Query("ndjson", description="NDJSON lines or one JSON array")
+):
+    """All matching values in one response, streamed in chunks without building ORM objects."""
+    logger.info(
+        f"GET /indicator-values/stream called: indicator={indicator}, country={country}, "
+        f"years={year_min}-{year_max}, format={format}"
+    )
+    indicator_ids = [i.id for i in await resolve_indicators(db, indicator)] if indicator else None
+    country_ids = [c.id for c in await resolve_countries(db, country)] if country else None
+    return stream_rows(stream_query(indicator_ids, country_ids, year_min, year_max), format)
+
 @router.get("/{iv_id}", response_model=IndicatorValueOut)
-def get_indicator_value(iv_id: int, db: Session = Depends(get_db)):
+async def get_indicator_value(iv_id: int, db: AsyncSession = Depends(get_async_db)):
     logger.info(f"GET /indicator-values/{iv_id} called")
-    iv = db.query(IndicatorValue).filter(IndicatorValue.id == iv_id).first()
+    iv = await db.get(IndicatorValue, iv_id)
     if not iv:
         logger.warning(f"Indicator value with id={iv_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Indicator value not found")
@@ -52,6 +114,9 @@ def create_indicator_value(iv_in: IndicatorValueCreate, db: Session = Depends(ge
     )
     db.add(iv)
     try:
+        db.flush()
+        refresh_rollups(db, [iv.indicator_id])
+        bump_data_version(db)
         db.commit()
         db.refresh(iv)
     except IntegrityError:
@@ -61,6 +126,145 @@ def create_indicator_value(iv_in: IndicatorValueCreate, db: Session = Depends(ge
     return iv
 
 
+# asyncpg accepts at most 32767 bind parameters per statement; each upserted row binds 4
+BULK_UPSERT_CHUNK_ROWS = 32767 // 4
+
+
+async def _read_bulk_body(request: Request):
+    """The request body, refused with 413 once it exceeds ``BULK_MAX_BODY_BYTES``, before it is read whole."""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Body exceeds {settings.BULK_MAX_BODY_BYTES} bytes"
+    )
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > settings.BULK_MAX_BODY_BYTES:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.BULK_MAX_BODY_BYTES:
+            raise too_large
+    return bytes(body)
+
+
+def _parse_bulk_body(body: bytes, content_type: str):
+    """Rows of a JSON array or NDJSON body, as ``(index, payload)``; a payload is ``None`` if its line is not JSON."""
+    if "ndjson" in content_type:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append((len(rows), orjson.loads(line)))
+            except orjson.JSONDecodeError:
+                rows.append((len(rows), None))
+        return rows
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body is not valid JSON")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Body must be a JSON array or NDJSON")
+    return list(enumerate(payload))
+
+
+def _resolve(ref_id, code, by_id, by_code, what):
+    if ref_id is not None:
+        if ref_id not in by_id:
+            raise ValueError(f"Unknown {what} id {ref_id}")
+        return ref_id
+    if not code:
+        raise ValueError(f"Missing {what} id or code")
+    id_ = by_code(code)
+    if id_ is None:
+        raise ValueError(f"Unknown {what} code {code}")
+    return id_
+
+
+@router.post("/bulk", response_model=BulkWriteResult)
+async def bulk_upsert_indicator_values(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Upsert up to ``BULK_MAX_ROWS`` values, sent as a JSON array or as NDJSON (``application/x-ndjson``).
+
+    Rows give ``indicator_id`` or ``indicator_code``, ``country_id`` or ``iso3``, ``date`` and ``value``.
+    Valid rows are written in one transaction, upserted in chunks keyed on (indicator, country, date);
+    invalid rows are rejected and reported by index without failing the rest.
+    """
+    parsed = _parse_bulk_body(await _read_bulk_body(request), request.headers.get("content-type", ""))
+    logger.info(f"POST /indicator-values/bulk called with {len(parsed)} rows")
+    if len(parsed) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ROWS} rows per request"
+        )
+
+    errors, rows = [], []
+    for index, payload in parsed:
+        if payload is None:
+            errors.append(BulkRowError(index=index, error="Invalid JSON"))
+            continue
+        try:
+            rows.append((index, IndicatorValueBulkRow.model_validate(payload)))
+        except ValidationError as e:
+            first = e.errors()[0]
+            errors.append(BulkRowError(index=index, error=f"{'.'.join(map(str, first['loc']))}: {first['msg']}"))
+
+    # writes check the dimension version now rather than trust the last interval
+    dimensions = await current_registry_async(db, force=True)
+    indicators = (dimensions.indicator_codes, dimensions.indicator_id)
+    countries = (dimensions.country_codes, dimensions.country_id)
+    by_key = {}
+    for index, row in rows:
+        try:
+            key = (
+                _resolve(row.indicator_id, row.indicator_code, *indicators, "indicator"),
+                _resolve(row.country_id, row.iso3, *countries, "country"),
+                row.date,
+            )
+        except ValueError as e:
+            errors.append(BulkRowError(index=index, error=str(e)))
+            continue
+        if key in by_key:
+            # one statement cannot touch the same row twice; the later row wins
+            errors.append(BulkRowError(index=by_key[key][0], error=f"Superseded by row {index} with the same key"))
+        by_key[key] = (index, row.value)
+
+    inserted = updated = 0
+    if by_key:
+        values = [
+            {"indicator_id": i, "country_id": c, "date": d, "value": value} for (i, c, d), (_, value) in by_key.items()
+        ]
+        try:
+            written = []
+            for start in range(0, len(values), BULK_UPSERT_CHUNK_ROWS):
+                stmt = insert(IndicatorValue).values(values[start:start + BULK_UPSERT_CHUNK_ROWS])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["indicator_id", "country_id", "date"],
+                    set_={"value": stmt.excluded.value},
+                    where=IndicatorValue.value.is_distinct_from(stmt.excluded.value),
+                ).returning(IndicatorValue.indicator_id, literal_column("xmax = 0").label("inserted"))
+                written.extend((await db.execute(stmt)).all())
+            inserted = sum(1 for r in written if r.inserted)
+            updated = len(written) - inserted
+            if written:
+                await db.run_sync(refresh_rollups, sorted({r.indicator_id for r in written}))
+                await db.run_sync(bump_data_version)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk upsert failed: {e}")
+            raise
+
+    errors.sort(key=lambda e: e.index)
+    result = BulkWriteResult(
+        received=len(parsed), inserted=inserted, updated=updated, unchanged=len(by_key) - inserted - updated,
+        rejected=len(errors), errors=errors
+    )
+    logger.info(
+        f"Bulk upsert: {result.inserted} inserted, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.rejected} rejected"
+    )
+    return result
+
 @router.put("/{iv_id}", response_model=IndicatorValueOut)
 def update_indicator_value(iv_id: int, iv_in: IndicatorValueUpdate, db: Session = Depends(get_db)):
     logger.info(f"PUT /indicator-values/{iv_id} called with value={iv_in.value}")
@@ -72,7 +276,10 @@ def update_indicator_value(iv_id: int, iv_in: IndicatorValueUpdate, db: Session
     if iv_in.value is not None:
         logger.info(f"Updating indicator value {iv_id} from {iv.value} to {iv_in.value}")
         iv.value = iv_in.value
+        db.flush()
+        refresh_rollups(db, [iv.indicator_id])
     
+    bump_data_version(db)
     db.commit()
     db.refresh(iv)
     logger.info(f"Indicator value {iv_id} updated successfully")
@@ -87,6 +294,9 @@ def delete_indicator_value(iv_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Indicator value not found")
     
     db.delete(iv)
+    db.flush()
+    refresh_rollups(db, [iv.indicator_id])
+    bump_data_version(db)
     db.commit()
     logger.info(f"Indicator value {iv_id} deleted successfully")
     return None
\ No newline at end of file
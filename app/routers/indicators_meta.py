@@ -1,37 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.schemas.indicators_meta import IndicatorMetaCreate, IndicatorMetaOut, IndicatorMetaUpdate
 from app.models.models import IndicatorMeta
 from app.db.db import get_db
+from app.db.async_db import get_async_db
+from app.db.data_version import bump_data_version
+from app.utils.pagination import CURSOR_DESCRIPTION, paginate
 from app.utils.logger import logger
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/indicators", tags=["Indicators"])
 
 @router.get("/", response_model=List[IndicatorMetaOut])
-def get_indicators(
-        db: Session = Depends(get_db),
+async def get_indicators(
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         page: int = Query(1, ge=1),
         limit: int = Query(10, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
         search: str = Query("", description="Search indicators by name or code")
 ):
-    logger.info(f"GET /indicators called with page={page}, limit={limit}, search='{search}'")
-    query = db.query(IndicatorMeta)
+    logger.info(f"GET /indicators called with page={page}, limit={limit}, cursor={cursor}, search='{search}'")
+    query = select(IndicatorMeta)
     if search:
-        query = query.filter(
+        query = query.where(
             (IndicatorMeta.name.ilike(f"%{search}%")) |
             (IndicatorMeta.code.ilike(f"%{search}%"))
         )
-    indicators = query.offset((page - 1) * limit).limit(limit).all()
+    indicators = await paginate(db, query, [IndicatorMeta.id], page, limit, cursor, response)
     logger.info(f"Returning {len(indicators)} indicators")
     return indicators
 
 @router.get("/{indicator_id}", response_model=IndicatorMetaOut)
-def get_indicator(indicator_id: int, db: Session = Depends(get_db)):
+async def get_indicator(indicator_id: int, db: AsyncSession = Depends(get_async_db)):
     logger.info(f"GET /indicators/{indicator_id} called")
-    indicator = db.query(IndicatorMeta).filter(IndicatorMeta.id == indicator_id).first()
+    indicator = await db.get(IndicatorMeta, indicator_id)
     if not indicator:
         logger.warning(f"Indicator with id={indicator_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Indicator not found")
@@ -49,6 +56,7 @@ def create_indicator(indicator_in: IndicatorMetaCreate, db: Session = Depends(ge
     )
     db.add(indicator)
     try:
+        bump_data_version(db, dimensions=True)
         db.commit()
         db.refresh(indicator)
     except IntegrityError:
@@ -71,6 +79,7 @@ def update_indicator(indicator_id: int, indicator_in: IndicatorMetaUpdate, db: S
         indicator.topic_id = indicator_in.topic_id
     if indicator_in.source_note is not None:
         indicator.source_note = indicator_in.source_note
+    bump_data_version(db, dimensions=True)
     db.commit()
     db.refresh(indicator)
     logger.info(f"Indicator with id={indicator_id} updated successfully")
@@ -84,6 +93,7 @@ def delete_indicator(indicator_id: int, db: Session = Depends(get_db)):
         logger.warning(f"Indicator with id={indicator_id} not found for deletion")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Indicator not found")
     db.delete(indicator)
+    bump_data_version(db, dimensions=True)
     db.commit()
     logger.info(f"Indicator with id={indicator_id} deleted successfully")
     return None
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Request
+from typing import List
+
+from app.db.instrumentation import ENGINE_METRICS
+from app.schemas.metrics import CacheMetricsOut, DbPoolMetricsOut
+from app.utils.cache import LRUCache
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/cache", response_model=CacheMetricsOut)
+def get_cache_metrics(request: Request):
+    """Hit rate and latency of the response cache since the process started."""
+    state = request.app.state
+    cache = state.cache
+    local = isinstance(cache, LRUCache)
+    return CacheMetricsOut(
+        backend=state.cache_backend,
+        entries=len(cache) if local else None,
+        size_bytes=cache.size if local else None,
+        evictions=cache.evictions if local else None,
+        **state.cache_metrics.snapshot(),
+    )
+
+
+@router.get("/db", response_model=List[DbPoolMetricsOut])
+def get_db_metrics():
+    """Pool gauges, checkout waits and query timings of each engine in this API process."""
+    return [metrics.snapshot() for metrics in ENGINE_METRICS.values()]
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal
+
+from app.schemas.search import SearchResult
+from app.db.async_db import get_async_db
+from app.utils.logger import logger
+from app.utils.search import run_search
+
+router = APIRouter(tags=["Search"])
+
+
+@router.get("/", response_model=List[SearchResult])
+async def search(
+        db: AsyncSession = Depends(get_async_db),
+        q: str = Query(..., min_length=1, description="Words, a code or a misspelt name"),
+        type: Literal["indicators", "countries"] = Query("indicators"),
+        limit: int = Query(20, ge=1, le=100)
+):
+    """Fuzzy and full-text matches on name, code and (for indicators) source note, best first.
+
+    For countries, ``code`` is the ISO3 code.
+    """
+    logger.info(f"GET /search called with q='{q}', type={type}, limit={limit}")
+    results = await run_search(db, type, "search", q, limit)
+    logger.info(f"Returning {len(results)} search results")
+    return results
+
+
+@router.get("/typeahead", response_model=List[SearchResult])
+async def typeahead(
+        db: AsyncSession = Depends(get_async_db),
+        q: str = Query(..., min_length=1, description="What has been typed so far"),
+        type: Literal["indicators", "countries"] = Query("indicators"),
+        limit: int = Query(10, ge=1, le=50)
+):
+    """Code prefixes first, then names whose words start with the typed words."""
+    logger.info(f"GET /search/typeahead called with q='{q}', type={type}")
+    return await run_search(db, type, "typeahead", q, limit)
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.config import settings
+from app.schemas.series import SeriesIndicator, SeriesOut
+from app.models.models import Country, IndicatorMeta, IndicatorValue
+from app.db.async_db import get_async_db
+from app.utils.logger import logger
+from app.utils.resolve import resolve_countries, resolve_indicators
+
+router = APIRouter(tags=["Series"])
+
+MAX_SERIES_INDICATORS = 20
+MAX_SERIES_COUNTRIES = 300
+
+
+def series_query(indicator_ids, country_ids, year_min, year_max):
+    query = (
+        select(IndicatorValue.indicator_id, Country.iso3, IndicatorValue.date, IndicatorValue.value)
+        .join(Country, Country.id == IndicatorValue.country_id)
+        .where(IndicatorValue.indicator_id.in_(indicator_ids))
+        .where(IndicatorValue.date >= year_min, IndicatorValue.date <= year_max)
+    )
+    if country_ids:
+        query = query.where(IndicatorValue.country_id.in_(country_ids))
+    return query
+
+
+@router.get("/", response_model=SeriesOut)
+async def get_series(
+        db: AsyncSession = Depends(get_async_db),
+        indicator: List[str] = Query(..., description="Indicator ids or codes; repeat for several"),
+        country: List[str] = Query([], description="Country ids or ISO3 codes; omit for all countries"),
+        year_min: int = Query(settings.MIN_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX),
+        year_max: int = Query(settings.MAX_YEAR, ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX)
+):
+    """Whole time series in one call: one value list per country, aligned to ``years`` (null where missing)."""
+    logger.info(f"GET /series called with indicator={indicator}, country={country}, years={year_min}-{year_max}")
+    if year_min > year_max:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="year_min must not exceed year_max")
+    if len(indicator) > MAX_SERIES_INDICATORS or len(country) > MAX_SERIES_COUNTRIES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MAX_SERIES_INDICATORS} indicators and {MAX_SERIES_COUNTRIES} countries per request"
+        )
+
+    indicators = await resolve_indicators(db, indicator)
+    country_ids = [c.id for c in await resolve_countries(db, country)] if country else None
+    query = series_query([i.id for i in indicators], country_ids, year_min, year_max)
+
+    names = dict((await db.execute(
+        select(IndicatorMeta.id, IndicatorMeta.name).where(IndicatorMeta.id.in_([i.id for i in indicators]))
+    )).all())
+    years = list(range(year_min, year_max + 1))
+    series = {i.id: {} for i in indicators}
+    for indicator_id, iso3, year, value in await db.execute(query):
+        values = series[indicator_id].get(iso3)
+        if values is None:
+            values = series[indicator_id][iso3] = [None] * len(years)
+        values[year - year_min] = value
+
+    logger.info(f"Returning series for {len(indicators)} indicators")
+    return SeriesOut(
+        years=years,
+        indicators=[
+            SeriesIndicator(id=i.id, code=i.code, name=names[i.id], series=dict(sorted(series[i.id].items())))
+            for i in indicators
+        ]
+    )
@@ -1,34 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.schemas.topics import TopicCreate, TopicOut, TopicUpdate
 from app.models.models import Topic
 from app.db.db import get_db
+from app.db.async_db import get_async_db
+from app.db.data_version import bump_data_version
+from app.utils.pagination import CURSOR_DESCRIPTION, paginate
 from app.utils.logger import logger
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/topics", tags=["Topics"])
 
 @router.get("/", response_model=List[TopicOut])
-def get_topics(
-        db: Session = Depends(get_db),
+async def get_topics(
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         page: int = Query(1, ge=1),
         limit: int = Query(10, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
         search: str = Query("", description="Search topics by name")
 ):
-    logger.info(f"GET /topics called with page={page}, limit={limit}, search='{search}'")
-    query = db.query(Topic)
+    logger.info(f"GET /topics called with page={page}, limit={limit}, cursor={cursor}, search='{search}'")
+    query = select(Topic)
     if search:
-        query = query.filter(Topic.name.ilike(f"%{search}%"))
-    topics = query.offset((page - 1) * limit).limit(limit).all()
+        query = query.where(Topic.name.ilike(f"%{search}%"))
+    topics = await paginate(db, query, [Topic.id], page, limit, cursor, response)
     logger.info(f"Returning {len(topics)} topics")
     return topics
 
 @router.get("/{topic_id}", response_model=TopicOut)
-def get_topic(topic_id: int, db: Session = Depends(get_db)):
+async def get_topic(topic_id: int, db: AsyncSession = Depends(get_async_db)):
     logger.info(f"GET /topics/{topic_id} called")
-    topic = db.query(Topic).filter(Topic.id == topic_id).first()
+    topic = await db.get(Topic, topic_id)
     if not topic:
         logger.warning(f"Topic with id={topic_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
@@ -41,6 +48,7 @@ def create_topic(topic_in: TopicCreate, db: Session = Depends(get_db)):
     topic = Topic(name=topic_in.name)
     db.add(topic)
     try:
+        bump_data_version(db)
         db.commit()
         db.refresh(topic)
     except IntegrityError:
@@ -58,6 +66,7 @@ def update_topic(topic_id: int, topic_in: TopicUpdate, db: Session = Depends(get
         logger.warning(f"Topic with id={topic_id} not found for update")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
     topic.name = topic_in.name
+    bump_data_version(db)
     db.commit()
     db.refresh(topic)
     logger.info(f"Topic with id={topic_id} updated successfully")
@@ -71,6 +80,7 @@ def delete_topic(topic_id: int, db: Session = Depends(get_db)):
         logger.warning(f"Topic with id={topic_id} not found for deletion")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
     db.delete(topic)
+    bump_data_version(db)
     db.commit()
     logger.info(f"Topic with id={topic_id} deleted successfully")
     return None
\ No newline at end of file
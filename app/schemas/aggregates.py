@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class RegionYearAggregate(BaseModel):
+    region: str
+    year: int
+    mean: float
+    median: float
+    min: float
+    max: float
+    count: int
+
+class GrowthPoint(BaseModel):
+    iso3: str
+    year: int
+    value: float
+    yoy_pct: Optional[float]
+
+class RankedValue(BaseModel):
+    year: int
+    rank: int
+    iso3: str
+    country: str
+    value: float
+
+class CoveragePoint(BaseModel):
+    year: int
+    countries: int
+    total_countries: int
+    share: float
+
+class LatestPoint(BaseModel):
+    iso3: str
+    country: str
+    year: int
+    value: float
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.core.config import settings
 
 class IndicatorValueBase(BaseModel):
     indicator_id: int
@@ -18,3 +19,24 @@ class IndicatorValueOut(IndicatorValueBase):
 
     class Config:
         from_attributes = True
+
+class IndicatorValueBulkRow(BaseModel):
+    indicator_id: Optional[int] = None
+    indicator_code: Optional[str] = None
+    country_id: Optional[int] = None
+    iso3: Optional[str] = None
+    # out-of-range years are rejected per row rather than failing the int4 column for the whole batch
+    date: int = Field(ge=settings.API_YEAR_MIN, le=settings.API_YEAR_MAX)
+    value: float
+
+class BulkRowError(BaseModel):
+    index: int
+    error: str
+
+class BulkWriteResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    errors: List[BulkRowError]
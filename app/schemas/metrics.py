@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+class LatencyStats(BaseModel):
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+
+class CacheMetricsOut(BaseModel):
+    backend: str
+    requests: int
+    hits: int
+    misses: int
+    not_modified: int
+    hit_rate: float
+    entries: Optional[int]
+    size_bytes: Optional[int]
+    evictions: Optional[int]
+    latency: Dict[str, LatencyStats]
+
+class DbPoolMetricsOut(BaseModel):
+    name: str
+    pool_size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    checkout_wait_p50_ms: Optional[float]
+    checkout_wait_p95_ms: Optional[float]
+    checkout_wait_max_ms: Optional[float]
+    queries: int
+    slow_queries: int
+    query_p50_ms: Optional[float]
+    query_p95_ms: Optional[float]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+class SearchResult(BaseModel):
+    id: int
+    code: str
+    name: str
+    score: float
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class SeriesIndicator(BaseModel):
+    id: int
+    code: str
+    name: str
+    series: Dict[str, List[Optional[float]]]
+
+class SeriesOut(BaseModel):
+    years: List[int]
+    indicators: List[SeriesIndicator]
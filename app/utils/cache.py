@@ -0,0 +1,274 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.db.db import SessionLocal
+from app.db.data_version import current_data_version
+from app.utils.logger import logger
+
+# GET paths that are never cached
+CACHE_EXCLUDE_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/metrics")
+
+# response headers stored with a cached body
+CACHED_HEADERS = ("content-type", "x-next-cursor")
+
+
+class LRUCache:
+    """In-process cache of ``bytes`` values with a TTL, bounded by entry count and total size."""
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None):
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.CACHE_MAX_BYTES
+        self.ttl = ttl or settings.CACHE_TTL
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self.size += len(value)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """Cache shared by every API process, stored in Redis (or anything with the same ``get``/``set``)."""
+
+    def __init__(self, client, ttl=None, prefix="wb-api:"):
+        self.client = client
+        self.ttl = ttl or settings.CACHE_TTL
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, value, ex=max(1, round(self.ttl)))
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+class FakeRedis:
+    """Local stand-in for a Redis client, covering the calls ``RedisCache`` makes."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value, expires_at = self._data.get(key, (None, None))
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def scan_iter(self, pattern):
+        prefix = pattern.rstrip("*")
+        with self._lock:
+            return [key for key in self._data if key.startswith(prefix)]
+
+
+def make_cache(backend=None):
+    """Cache backend named by ``settings.CACHE_BACKEND``: memory, redis, fake-redis or off."""
+    backend = backend or settings.CACHE_BACKEND
+    if backend == "memory":
+        return LRUCache()
+    if backend == "redis":
+        import redis
+        return RedisCache(redis.Redis.from_url(settings.CACHE_REDIS_URL))
+    if backend == "fake-redis":
+        return RedisCache(FakeRedis())
+    if backend == "off":
+        return None
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+class CacheMetrics:
+    def __init__(self, window=1000):
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._latencies = {"hit": deque(maxlen=window), "miss": deque(maxlen=window)}
+        self._lock = threading.Lock()
+
+    def record(self, outcome, elapsed_ms, not_modified=False):
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.not_modified += not_modified
+            self._latencies[outcome].append(elapsed_ms)
+
+    def snapshot(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            latency = {}
+            for outcome, values in self._latencies.items():
+                ordered = sorted(values)
+                latency[outcome] = {
+                    "p50_ms": ordered[len(ordered) // 2] if ordered else None,
+                    "p95_ms": ordered[int(len(ordered) * 0.95)] if ordered else None,
+                }
+            return {
+                "requests": requests,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "latency": latency,
+            }
+
+
+def normalise_query(query_string):
+    """Query string with its parameters sorted, so equivalent URLs share a cache key."""
+    return urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+
+
+def etag_for(body):
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _pack(headers, body):
+    return json.dumps(headers).encode() + b"\n" + body
+
+
+def _unpack(value):
+    headers, _, body = value.partition(b"\n")
+    return json.loads(headers), body
+
+
+class DataVersionTracker:
+    """Current data version, re-read from the database at most every ``interval`` seconds."""
+
+    def __init__(self, interval=None):
+        self.interval = settings.CACHE_VERSION_CHECK_INTERVAL if interval is None else interval
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._version is None or time.monotonic() - self._checked_at >= self.interval:
+                session = SessionLocal()
+                try:
+                    self._version = current_data_version(session)
+                finally:
+                    session.close()
+                self._checked_at = time.monotonic()
+            return self._version
+
+    def expire(self):
+        with self._lock:
+            self._checked_at = 0.0
+
+
+class CacheMiddleware(BaseHTTPMiddleware):
+    """Caches successful GET responses keyed on path, normalised query parameters and data version.
+
+    Any ETL load or write route bumps the data version, so stale entries are never served; they
+    simply stop being looked up and age out. Responses carry an ETag and a matching
+    ``If-None-Match`` gets a 304. Responses sent with ``Cache-Control: no-store`` (streams) pass through.
+    """
+
+    def __init__(self, app, cache=None, metrics=None, versions=None):
+        super().__init__(app)
+        self.cache = cache
+        self.metrics = metrics or CacheMetrics()
+        self.versions = versions or DataVersionTracker()
+
+    async def dispatch(self, request, call_next):
+        if request.method != "GET" or request.url.path.startswith(CACHE_EXCLUDE_PREFIXES):
+            response = await call_next(request)
+            if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+                # this process saw the write, no need to wait for the next version check
+                self.versions.expire()
+            return response
+
+        start = time.perf_counter()
+        version = await run_in_threadpool(self.versions.get)
+        key = f"{version}:{request.url.path}?{normalise_query(request.url.query)}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            headers, body = _unpack(cached)
+            outcome = "hit"
+        else:
+            response = await call_next(request)
+            if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            headers = {k: v for k, v in response.headers.items() if k in CACHED_HEADERS}
+            headers["etag"] = etag_for(body)
+            self.cache.set(key, _pack(headers, body))
+            outcome = "miss"
+
+        if_none_match = request.headers.get("if-none-match", "")
+        not_modified = headers["etag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if not_modified:
+            response = Response(status_code=304, headers={"etag": headers["etag"]})
+        else:
+            response = Response(body, headers=headers)
+        response.headers["x-cache"] = outcome.upper()
+        self.metrics.record(outcome, (time.perf_counter() - start) * 1000, not_modified)
+        return response
+
+
+def install_cache(app, backend=None):
+    """Add ``CacheMiddleware`` to ``app`` and expose its cache and metrics on ``app.state``."""
+    app.state.cache_backend = backend or settings.CACHE_BACKEND
+    app.state.cache = make_cache(backend)
+    app.state.cache_metrics = CacheMetrics()
+    if app.state.cache is None:
+        logger.info("Response cache disabled")
+        return
+    app.add_middleware(CacheMiddleware, cache=app.state.cache, metrics=app.state.cache_metrics)
@@ -1,12 +1,31 @@
+import atexit
+import os
+import queue
+import threading
+import time
 from loguru import logger
 from datetime import datetime
+from sqlalchemy import insert
+from app.core.config import settings
 from app.db.db import SessionLocal
 from app.models.models import ETLLog
 
-# log to file
-logger.add("logs/etl.log", format="{time} {level} {message}", level="INFO", rotation="404 MB")
+# log to file; each file is written and rotated by one process only
+FILE_SINK_OPTIONS = dict(format="{time} {level} {message}", level="INFO", rotation="404 MB")
+file_sink_id = logger.add("logs/etl.log", **FILE_SINK_OPTIONS)
 
-# log to database
+
+def use_worker_log_file():
+    """Switch this process's file logging to ``logs/etl.worker-<pid>.log``.
+
+    Run in spawned worker processes, which import this module afresh and would otherwise rotate the
+    parent's ``logs/etl.log`` concurrently with it.
+    """
+    global file_sink_id
+    logger.remove(file_sink_id)
+    file_sink_id = logger.add(f"logs/etl.worker-{os.getpid()}.log", enqueue=True, **FILE_SINK_OPTIONS)
+
+# log to database, one transaction per message (LOG_DB_SINK=sync)
 def db_sink(message):
     record = message.record
     session = SessionLocal()
@@ -24,4 +43,87 @@ def db_sink(message):
     finally:
         session.close()
 
-logger.add(db_sink, level="INFO")
+
+WRITER_THREAD_NAME = "etl-log-writer"
+
+
+class BatchedDBSink:
+    """Loguru sink that queues records for a background thread, which inserts them into etl_log in batches.
+
+    A batch is written once it reaches ``batch_size`` records or ``flush_interval`` seconds have passed.
+    When the queue is full, ``overflow="drop"`` discards the record (counted in ``dropped``) and
+    ``overflow="block"`` makes the logging call wait. ``stop()`` drains the queue and runs at exit.
+    """
+
+    def __init__(self, max_queue=None, batch_size=None, flush_interval=None, overflow=None):
+        self.queue = queue.Queue(maxsize=max_queue or settings.LOG_QUEUE_SIZE)
+        self.batch_size = batch_size or settings.LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.LOG_FLUSH_INTERVAL
+        self.overflow = overflow or settings.LOG_OVERFLOW
+        self.dropped = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=WRITER_THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def write(self, message):
+        record = message.record
+        entry = {
+            "timestamp": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
+            "level": record["level"].name,
+            "message": record["message"],
+        }
+        if self.overflow == "block":
+            self.queue.put(entry)
+            return
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self._thread.join(timeout=self.flush_interval + 10)
+
+    def _next_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        session = SessionLocal()
+        try:
+            session.execute(insert(ETLLog), batch)
+            session.commit()
+        except Exception:
+            session.rollback()
+        finally:
+            session.close()
+
+
+if settings.LOG_DB_SINK == "batched":
+    batched_db_sink = BatchedDBSink()
+    # the writer's own records (e.g. a slow-query warning on its INSERT) would wait on the queue it
+    # drains; with LOG_OVERFLOW=block that deadlocks, so they only reach the other sinks
+    logger.add(
+        batched_db_sink, level="INFO", format="{message}",
+        filter=lambda record: record["thread"].name != WRITER_THREAD_NAME,
+    )
+    atexit.register(batched_db_sink.stop)
+elif settings.LOG_DB_SINK == "sync":
+    logger.add(db_sink, level="INFO")
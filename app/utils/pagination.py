@@ -0,0 +1,62 @@
+import base64
+import json
+from fastapi import HTTPException, Response, status
+from sqlalchemy import BigInteger, Integer, SmallInteger, tuple_
+
+CURSOR_HEADER = "X-Next-Cursor"
+CURSOR_DESCRIPTION = (
+    "Keyset pagination cursor. Pass an empty value to start, then the X-Next-Cursor header "
+    "of the previous response. When set, `page` is ignored."
+)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _fits(value, column):
+    """Whether a decoded cursor value can be bound against ``column`` without a database error."""
+    python_type = column.type.python_type
+    if isinstance(value, bool):
+        return python_type is bool
+    if python_type is float:
+        return isinstance(value, (int, float))
+    if isinstance(column.type, Integer) and isinstance(value, int):
+        # the database rejects a key wider than the column
+        bits = 64 if isinstance(column.type, BigInteger) else 16 if isinstance(column.type, SmallInteger) else 32
+        return -2**(bits - 1) <= value < 2**(bits - 1)
+    return isinstance(value, python_type)
+
+
+def decode_cursor(cursor, columns):
+    """Key values of ``cursor``, checked against the types of the ``columns`` it orders by."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if (
+        not isinstance(values, list) or len(values) != len(columns)
+        or not all(_fits(v, c) for v, c in zip(values, columns))
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+async def paginate(db, stmt, order_by, page, limit, cursor, response: Response):
+    """Order the ``stmt`` select by the ``order_by`` columns and return one page of its rows.
+
+    With a ``cursor`` the page starts strictly after the encoded key (a keyset seek, constant cost at
+    any depth); otherwise ``page`` is applied as an OFFSET. Whenever a full page is returned, the key
+    of its last row is sent back as an opaque cursor in the ``X-Next-Cursor`` header.
+    """
+    stmt = stmt.order_by(*order_by)
+    if cursor is not None:
+        if cursor:
+            stmt = stmt.where(tuple_(*order_by) > tuple_(*decode_cursor(cursor, order_by)))
+    else:
+        stmt = stmt.offset((page - 1) * limit)
+
+    rows = (await db.execute(stmt.limit(limit))).scalars().all()
+    if len(rows) == limit:
+        response.headers[CURSOR_HEADER] = encode_cursor([getattr(rows[-1], c.key) for c in order_by])
+    return rows
@@ -0,0 +1,66 @@
+from typing import NamedTuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.registry import current_registry_async
+
+
+class ResolvedIndicator(NamedTuple):
+    id: int
+    code: str
+
+
+class ResolvedCountry(NamedTuple):
+    id: int
+    iso3: str
+
+
+def split_identifiers(identifiers):
+    """Split query values into numeric ids and codes (upper-cased)."""
+    ids = {int(i) for i in identifiers if i.isdigit()}
+    codes = {i.upper() for i in identifiers if not i.isdigit()}
+    return ids, codes
+
+
+def lookup_indicators(dimensions, ids, codes):
+    found = {i: ResolvedIndicator(i, dimensions.indicator_codes[i]) for i in ids if i in dimensions.indicator_codes}
+    for code in codes:
+        id_ = dimensions.indicator_id(code)
+        if id_ is not None:
+            found[id_] = ResolvedIndicator(id_, dimensions.indicator_codes[id_])
+    missing = {i for i in ids if i not in dimensions.indicator_codes} | {c for c in codes if dimensions.indicator_id(c) is None}
+    return [found[i] for i in sorted(found)], missing
+
+
+def lookup_countries(dimensions, ids, codes):
+    found = {i: ResolvedCountry(i, dimensions.country_codes[i]) for i in ids if i in dimensions.country_codes}
+    for code in codes:
+        id_ = dimensions.country_id(code)
+        if id_ is not None:
+            found[id_] = ResolvedCountry(id_, dimensions.country_codes[id_])
+    missing = {i for i in ids if i not in dimensions.country_codes} | {c for c in codes if dimensions.country_id(c) is None}
+    return list(found.values()), missing
+
+
+async def _resolve(db, identifiers, lookup, what):
+    ids, codes = split_identifiers(identifiers)
+    dimensions = await current_registry_async(db)
+    rows, missing = lookup(dimensions, ids, codes)
+    if missing:
+        # a dimension may have been written since the last version check
+        dimensions = await current_registry_async(db, force=True)
+        rows, missing = lookup(dimensions, ids, codes)
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown {what}: {sorted(map(str, missing))}")
+    return rows
+
+
+async def resolve_indicators(db: AsyncSession, identifiers):
+    """``(id, code)`` of each indicator id or code, ordered by id; 404 if any is unknown."""
+    return await _resolve(db, identifiers, lookup_indicators, "indicators")
+
+
+async def resolve_countries(db: AsyncSession, identifiers):
+    """``(id, iso3)`` of each country id or ISO3 code; 404 if any is unknown."""
+    return await _resolve(db, identifiers, lookup_countries, "countries")
@@ -0,0 +1,199 @@
+import bisect
+import re
+from collections import defaultdict
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.data_version import DIMENSION_VERSION, current_data_version
+from app.models.models import INDICATOR_SEARCH_DOCUMENT, Country, IndicatorMeta
+
+SIMILARITY_THRESHOLD = 0.3  # pg_trgm's default for the % operator
+WORD = re.compile(r"[0-9a-z]+")
+ENGLISH = text("'english'::regconfig")
+
+
+def escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def prefix_tsquery(term):
+    """``a & b & c:*`` from the words of ``term``: every word must match, the last one as a prefix."""
+    words = WORD.findall(term.lower())
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"]) if words else None
+
+
+# --- PostgreSQL: pg_trgm + full-text, served by the GIN indexes on the models -----------------------
+
+def _indicator_search(term, limit):
+    tsquery = func.websearch_to_tsquery(ENGLISH, term)
+    pattern = f"%{escape_like(term)}%"
+    score = (
+        func.greatest(func.similarity(IndicatorMeta.name, term), func.similarity(IndicatorMeta.code, term))
+        + func.ts_rank(INDICATOR_SEARCH_DOCUMENT, tsquery)
+    )
+    return (
+        select(IndicatorMeta.id, IndicatorMeta.code, IndicatorMeta.name, score.label("score"))
+        .where(or_(
+            IndicatorMeta.name.ilike(pattern), IndicatorMeta.code.ilike(pattern),
+            IndicatorMeta.name.op("%")(term), INDICATOR_SEARCH_DOCUMENT.op("@@")(tsquery),
+        ))
+        .order_by(score.desc(), IndicatorMeta.id)
+        .limit(limit)
+    )
+
+
+def _country_search(term, limit):
+    pattern = f"%{escape_like(term)}%"
+    score = func.greatest(func.similarity(Country.name, term), func.similarity(Country.iso3, term))
+    return (
+        select(Country.id, Country.iso3.label("code"), Country.name, score.label("score"))
+        .where(or_(Country.name.ilike(pattern), Country.iso3.ilike(pattern), Country.name.op("%")(term)))
+        .order_by(score.desc(), Country.id)
+        .limit(limit)
+    )
+
+
+def _indicator_typeahead(term, limit):
+    code_prefix = IndicatorMeta.code.ilike(f"{escape_like(term)}%")
+    conditions = [code_prefix]
+    tsquery = prefix_tsquery(term)
+    if tsquery:
+        conditions.append(INDICATOR_SEARCH_DOCUMENT.op("@@")(func.to_tsquery(ENGLISH, tsquery)))
+    score = code_prefix.cast(IndicatorMeta.id.type) + func.similarity(IndicatorMeta.name, term)
+    return (
+        select(IndicatorMeta.id, IndicatorMeta.code, IndicatorMeta.name, score.label("score"))
+        .where(or_(*conditions))
+        .order_by(score.desc(), IndicatorMeta.name)
+        .limit(limit)
+    )
+
+
+def _country_typeahead(term, limit):
+    prefix = f"{escape_like(term)}%"
+    code_prefix = Country.iso3.ilike(prefix)
+    score = code_prefix.cast(Country.id.type) + func.similarity(Country.name, term)
+    return (
+        select(Country.id, Country.iso3.label("code"), Country.name, score.label("score"))
+        .where(or_(code_prefix, Country.name.ilike(prefix), Country.name.ilike(f"% {prefix}")))
+        .order_by(score.desc(), Country.name)
+        .limit(limit)
+    )
+
+
+QUERIES = {
+    ("indicators", "search"): _indicator_search,
+    ("countries", "search"): _country_search,
+    ("indicators", "typeahead"): _indicator_typeahead,
+    ("countries", "typeahead"): _country_typeahead,
+}
+
+
+# --- in-process fallback for databases without pg_trgm (SQLite test setups) --------------------------
+
+def trigrams(value):
+    """pg_trgm-style trigrams: lower-cased words padded with two spaces in front and one behind."""
+    grams = set()
+    for word in WORD.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class SearchIndex:
+    """In-memory approximation of the PostgreSQL search: trigram similarity, substring and word-prefix
+    matching over ``(id, code, name, note)`` documents."""
+
+    def __init__(self, docs):
+        self.docs = [(id_, code, name, f"{name} {code} {note or ''}".lower()) for id_, code, name, note in docs]
+        self._name_grams = [trigrams(name) for _, _, name, _ in self.docs]
+        self._code_grams = [trigrams(code) for _, code, _, _ in self.docs]
+        self._by_gram = defaultdict(set)
+        self._by_word = defaultdict(set)
+        for i, (_, _, _, document) in enumerate(self.docs):
+            for gram in self._name_grams[i] | self._code_grams[i]:
+                self._by_gram[gram].add(i)
+            for word in WORD.findall(document):
+                self._by_word[word].add(i)
+        self._words = sorted(self._by_word)
+        self._codes = sorted((code.lower(), i) for i, (_, code, _, _) in enumerate(self.docs))
+
+    def _result(self, i, score):
+        id_, code, name, _ = self.docs[i]
+        return {"id": id_, "code": code, "name": name, "score": score}
+
+    def _prefixed(self, prefix):
+        start = bisect.bisect_left(self._words, prefix)
+        matched = set()
+        for word in self._words[start:]:
+            if not word.startswith(prefix):
+                break
+            matched |= self._by_word[word]
+        return matched
+
+    def search(self, term, limit):
+        grams = trigrams(term)
+        needle = term.lower()
+        words = WORD.findall(needle)
+        candidates = set().union(*(self._by_gram.get(g, ()) for g in grams)) if grams else set()
+        if words:
+            candidates |= set.intersection(*(self._by_word.get(w, set()) for w in words))
+
+        results = []
+        for i in candidates:
+            _, code, name, document = self.docs[i]
+            score = max(similarity(grams, self._name_grams[i]), similarity(grams, self._code_grams[i]))
+            matched = sum(w in self._by_word and i in self._by_word[w] for w in words)
+            if score >= SIMILARITY_THRESHOLD or needle in name.lower() or needle in code.lower() or (words and matched == len(words)):
+                results.append((score + 0.1 * matched / max(1, len(words)), i))
+        results.sort(key=lambda r: (-r[0], self.docs[r[1]][0]))
+        return [self._result(i, score) for score, i in results[:limit]]
+
+    def typeahead(self, term, limit):
+        needle = term.lower()
+        start = bisect.bisect_left(self._codes, (needle,))
+        code_hits = set()
+        for code, i in self._codes[start:]:
+            if not code.startswith(needle):
+                break
+            code_hits.add(i)
+
+        words = WORD.findall(needle)
+        word_hits = set()
+        if words:
+            word_hits = set.intersection(*(self._by_word.get(w, set()) for w in words[:-1]), self._prefixed(words[-1]))
+
+        grams = trigrams(term)
+        results = [
+            ((i in code_hits) + similarity(grams, self._name_grams[i]), i) for i in code_hits | word_hits
+        ]
+        results.sort(key=lambda r: (-r[0], self.docs[r[1]][2]))
+        return [self._result(i, score) for score, i in results[:limit]]
+
+
+# fallback indexes by entity, rebuilt when the dimension version moves
+_fallback = {}
+
+
+async def _fallback_index(db: AsyncSession, entity):
+    version = await db.run_sync(current_data_version, DIMENSION_VERSION)
+    cached = _fallback.get(entity)
+    if cached is None or cached[0] != version:
+        if entity == "indicators":
+            query = select(IndicatorMeta.id, IndicatorMeta.code, IndicatorMeta.name, IndicatorMeta.source_note)
+        else:
+            query = select(Country.id, Country.iso3, Country.name, Country.region)
+        cached = _fallback[entity] = (version, SearchIndex((await db.execute(query)).all()))
+    return cached[1]
+
+
+async def run_search(db: AsyncSession, entity, mode, term, limit):
+    """Ranked ``{id, code, name, score}`` matches for ``term``; ``mode`` is ``search`` or ``typeahead``."""
+    if db.get_bind().dialect.name == "postgresql":
+        return (await db.execute(QUERIES[(entity, mode)](term, limit))).mappings().all()
+    index = await _fallback_index(db, entity)
+    return index.search(term, limit) if mode == "search" else index.typeahead(term, limit)
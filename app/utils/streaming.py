@@ -0,0 +1,44 @@
+import orjson
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.db.async_db import AsyncSessionLocal
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+
+def encode_chunk(columns, rows, fmt, first):
+    """Serialise one chunk of column tuples as NDJSON lines or as a slice of a JSON array."""
+    if fmt == "ndjson":
+        return b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    body = b",".join(orjson.dumps(dict(zip(columns, row))) for row in rows)
+    return body if first else b"," + body
+
+
+async def iter_rows(stmt, fmt, chunk_rows=None):
+    """Run ``stmt`` on a server-side cursor and yield the encoded result ``chunk_rows`` rows at a time.
+
+    The rows stay plain tuples from the driver; no ORM entities or Pydantic models are built.
+    """
+    chunk_rows = chunk_rows or settings.STREAM_CHUNK_ROWS
+    columns = [c.name for c in stmt.selected_columns]
+    if fmt == "json":
+        yield b"["
+    first = True
+    # own session: the request's session may already be closed while the body is sent
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=chunk_rows))
+        async for rows in result.partitions():
+            yield encode_chunk(columns, rows, fmt, first)
+            first = False
+    if fmt == "json":
+        yield b"]"
+
+
+def stream_rows(stmt, fmt="ndjson", chunk_rows=None):
+    """``StreamingResponse`` of ``stmt``'s rows; marked no-store so the response cache passes it through."""
+    return StreamingResponse(
+        iter_rows(stmt, fmt, chunk_rows),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-store"},
+    )
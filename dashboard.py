@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import plotly.express as px
 import pandas as pd
@@ -6,55 +7,73 @@ import time
 import threading
 from typing import List, Optional
 
+os.environ.setdefault("DB_PROFILE", "dashboard")
+
+from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
 from app.db.db import engine
-from app.models.models import Topic, IndicatorMeta, Country, IndicatorValue, ETLLog
+from app.db.data_version import current_data_version
+from app.db.queries import indicator_data_query
+from app.models.models import Topic, IndicatorMeta, Country, ETLLog
 
 # Database session
 Session = sessionmaker(bind=engine)
 
+# Cached loaders. ``data_version`` is part of every cache key, so an ETL run or API write
+# (which bumps it) invalidates them, while the periodic reruns hit the cache.
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_topics(data_version: int):
+    with Session() as session:
+        return session.execute(select(Topic.id, Topic.name).order_by(Topic.name)).all()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_indicators(topic_id: int, data_version: int):
+    with Session() as session:
+        return session.execute(
+            select(IndicatorMeta.id, IndicatorMeta.code, IndicatorMeta.name).where(IndicatorMeta.topic_id == topic_id)
+        ).all()
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_countries(data_version: int):
+    with Session() as session:
+        return session.execute(select(Country.id, Country.name).order_by(Country.name)).all()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_indicator_data(indicator_ids: tuple, country_ids: tuple, year_min: int, year_max: int, data_version: int) -> pd.DataFrame:
+    """Every selected indicator x country x year in one joined, column-only query."""
+    query = indicator_data_query(indicator_ids, country_ids, year_min, year_max)
+    with Session() as session:
+        rows = session.execute(query).all()
+    return pd.DataFrame(rows, columns=["indicator_id", "indicator", "country", "year", "value"])
+
 class DatabaseService:
     
     def __init__(self):
         self.session = Session()
+        self.data_version = current_data_version(self.session)
     
-    def get_topics(self) -> List[Topic]:
-        return self.session.query(Topic).order_by(Topic.name).all()
+    def get_topics(self):
+        return load_topics(self.data_version)
     
-    def get_indicators_by_topic(self, topic_id: int) -> List[IndicatorMeta]:
-        return self.session.query(IndicatorMeta).filter_by(topic_id=topic_id).all()
+    def get_indicators_by_topic(self, topic_id: int):
+        return load_indicators(topic_id, self.data_version)
     
-    def get_countries(self) -> List[Country]:
-        return self.session.query(Country).order_by(Country.name).all()
+    def get_countries(self):
+        return load_countries(self.data_version)
     
-    def get_indicator_data(self, indicator_id: int, country_ids: List[int], year_min: int, year_max: int) -> pd.DataFrame:
-        rows = (
-            self.session.query(IndicatorValue)
-            .filter(IndicatorValue.indicator_id == indicator_id)
-            .filter(IndicatorValue.country_id.in_(country_ids))
-            .filter(IndicatorValue.date >= year_min)
-            .filter(IndicatorValue.date <= year_max)
-            .all()
+    def get_indicator_data(self, indicator_ids: List[int], country_ids: List[int], year_min: int, year_max: int) -> pd.DataFrame:
+        return load_indicator_data(
+            tuple(sorted(indicator_ids)), tuple(sorted(country_ids)), year_min, year_max, self.data_version
         )
-        return pd.DataFrame([{
-            "country": r.country.name,
-            "year": r.date,
-            "value": r.value,
-            "indicator_id": indicator_id
-        } for r in rows])
     
     def get_latest_logs(self, limit: int = 50) -> pd.DataFrame:
-        logs = (
-            self.session.query(ETLLog)
+        logs = self.session.execute(
+            select(ETLLog.timestamp, ETLLog.level, ETLLog.message)
             .order_by(ETLLog.timestamp.desc())
             .limit(limit)
-            .all()
-        )
-        return pd.DataFrame([{
-            "timestamp": log.timestamp,
-            "level": log.level,
-            "message": log.message
-        } for log in logs])
+        ).all()
+        return pd.DataFrame(logs, columns=["timestamp", "level", "message"])
     
     def close(self):
         self.session.close()
@@ -66,11 +85,13 @@ class ETLService:
     def run_etl_pipeline() -> tuple[bool, str]:
         try:
             result = subprocess.run(
-                ["python", "-m", "app.etl.pipeline"],
+                ["python", "-m", "scripts.run_etl", "--sample", "20"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
-                check=True
+                check=True,
+                # the ETL needs its own pool and no statement timeout, not this process's profile
+                env={**os.environ, "DB_PROFILE": "etl"}
             )
             return True, result.stdout
         except subprocess.CalledProcessError as e:
@@ -229,43 +250,23 @@ def render_dashboard(db_service: DatabaseService, selected_indicators, selected_
         st.warning("Please select at least one indicator and one country from the sidebar to view data.")
         return
     
-    country_ids = [c.id for c in selected_countries]
-    all_data = []
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for i, indicator in enumerate(selected_indicators):
-        status_text.text(f"Loading data for {indicator.name}...")
-        
-        df = db_service.get_indicator_data(
-            indicator.id, 
-            country_ids, 
-            year_range[0], 
-            year_range[1]
-        )
-        
-        if not df.empty:
-            df['indicator'] = indicator.name
-            all_data.append(df)
-        
-        progress_bar.progress((i + 1) / len(selected_indicators))
-    
-    progress_bar.empty()
-    status_text.empty()
+    combined_data = db_service.get_indicator_data(
+        [i.id for i in selected_indicators],
+        [c.id for c in selected_countries],
+        year_range[0],
+        year_range[1]
+    )
     
-    if not all_data:
+    if combined_data.empty:
         st.warning("No data available for the selected filters.")
         return
     
-    combined_data = pd.concat(all_data, ignore_index=True)
-    
     tab1, tab2, tab3 = st.tabs(["Trends", "Heatmaps", "Raw Data"])
     
     with tab1:
         st.header("Indicator Trends Over Time")
         for indicator in selected_indicators:
-            indicator_data = combined_data[combined_data['indicator'] == indicator.name]
+            indicator_data = combined_data[combined_data['indicator_id'] == indicator.id]
             
             if indicator_data.empty:
                 st.warning(f"No data available for {indicator.name}")
@@ -278,7 +279,7 @@ def render_dashboard(db_service: DatabaseService, selected_indicators, selected_
     with tab2:
         st.header("Country Comparison Heatmaps")
         for indicator in selected_indicators:
-            indicator_data = combined_data[combined_data['indicator'] == indicator.name]
+            indicator_data = combined_data[combined_data['indicator_id'] == indicator.id]
             
             if indicator_data.empty:
                 continue
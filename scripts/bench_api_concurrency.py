@@ -0,0 +1,122 @@
+# scripts/bench_api_concurrency.py
+#
+# Requests/sec and latency percentiles of the async read endpoints against the
+# previous sync stack (``def`` endpoints on a sync Session), under many concurrent
+# clients. Each stack runs in its own uvicorn process with the response cache off.
+# Needs the configured PostgreSQL database with loaded values.
+#   python -m scripts.bench_api_concurrency --concurrency 200 --duration 15
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+PORT = 8405
+PATHS = (
+    "/indicator-values/indicator-values/?indicator_id={indicator_id}&limit=100",
+    "/topics/topics/?limit=20",
+)
+
+
+def sync_app():
+    """The read endpoints as they were before the async session: sync ``def`` handlers on the threadpool."""
+    from fastapi import Depends, FastAPI, Query
+    from sqlalchemy.orm import Session
+    from app.db.db import get_db
+    from app.models.models import IndicatorValue, Topic
+
+    app = FastAPI()
+
+    @app.get("/indicator-values/indicator-values/")
+    def get_indicator_values(db: Session = Depends(get_db), indicator_id: int = Query(None),
+                             page: int = Query(1), limit: int = Query(10)):
+        query = db.query(IndicatorValue).filter(IndicatorValue.indicator_id == indicator_id)
+        query = query.order_by(IndicatorValue.indicator_id, IndicatorValue.country_id, IndicatorValue.date)
+        return [{"id": r.id, "indicator_id": r.indicator_id, "country_id": r.country_id, "date": r.date,
+                 "value": r.value} for r in query.offset((page - 1) * limit).limit(limit).all()]
+
+    @app.get("/topics/topics/")
+    def get_topics(db: Session = Depends(get_db), page: int = Query(1), limit: int = Query(10)):
+        rows = db.query(Topic).order_by(Topic.id).offset((page - 1) * limit).limit(limit).all()
+        return [{"id": r.id, "name": r.name} for r in rows]
+
+    return app
+
+
+def serve(stack):
+    import uvicorn
+    from app.api import create_app
+    app = create_app() if stack == "async" else sync_app()
+    uvicorn.run(app, host="127.0.0.1", port=PORT, log_level="warning")
+
+
+async def load(urls, concurrency, duration):
+    timings, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client, n):
+        nonlocal errors
+        i = n
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                res = await client.get(urls[i % len(urls)])
+                if res.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            timings.append((time.perf_counter() - start) * 1000)
+            i += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return timings, errors, elapsed
+
+
+def wait_until_up(timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/topics/topics/?limit=1", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("API did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--indicators", type=int, default=20, help="Indicator ids cycled through by the clients")
+    parser.add_argument("--serve", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve)
+
+    urls = [path.format(indicator_id=i) for i in range(1, args.indicators + 1) for path in PATHS]
+    env = {**os.environ, "CACHE_BACKEND": "off", "LOG_DB_SINK": "off"}
+    for stack in ("sync", "async"):
+        server = subprocess.Popen([sys.executable, "-m", "scripts.bench_api_concurrency", "--serve", stack], env=env)
+        try:
+            wait_until_up()
+            timings, errors, elapsed = asyncio.run(load(urls, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        timings.sort()
+        print(f"{stack:>5}: {len(timings) / elapsed:8.1f} req/s  p50 {statistics.median(timings):8.1f} ms  "
+              f"p99 {timings[int(len(timings) * 0.99)]:8.1f} ms  errors {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# scripts/bench_extract.py
+#
+# Sequential vs concurrent indicator extraction against the local stub API.
+#   python -m scripts.bench_extract --indicators 8 --latency 0.05
+
+import argparse
+import time
+
+from app.core.config import settings
+from scripts.stub_worldbank_api import start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--indicators", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-page", type=int, default=1000)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency=args.latency, n_indicators=args.indicators)
+    settings.WB_API_BASE_URL = base_url
+    settings.WB_PER_PAGE = args.per_page
+    settings.HTTP_CACHE = False
+
+    from app.etl.extract import fetch_indicator_values
+    from app.etl.async_extract import fetch_many_indicator_values
+
+    codes = [f"STUB.IND.{i}" for i in range(args.indicators)]
+
+    start = time.perf_counter()
+    sequential = {code: fetch_indicator_values(code) for code in codes}
+    seq_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = fetch_many_indicator_values(codes)
+    conc_time = time.perf_counter() - start
+
+    assert sequential == concurrent, "concurrent extract returned different records"
+    n_records = sum(len(v) for v in concurrent.values())
+    print(f"records:    {n_records}")
+    print(f"sequential: {seq_time:.2f}s")
+    print(f"concurrent: {conc_time:.2f}s ({seq_time / conc_time:.1f}x)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# scripts/bench_http_cache.py
+#
+# Extraction against a stub API that answers 502 to a share of requests before
+# recovering: without retries, with retries (cold page cache), from the warm page
+# cache, and offline from the cache alone. The cache lives in a temp directory.
+#   python -m scripts.bench_http_cache --indicators 8 --latency 0.05 --fail-rate 0.2
+
+import argparse
+import tempfile
+import time
+
+from app.core.config import settings
+from scripts.stub_worldbank_api import start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--indicators", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="Share of request paths that fail at first")
+    parser.add_argument("--fail-times", type=int, default=2, help="Failed attempts before such a path recovers")
+    parser.add_argument("--per-page", type=int, default=1000)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency=args.latency, fail_rate=args.fail_rate,
+                                         fail_times=args.fail_times, n_indicators=args.indicators)
+    settings.WB_API_BASE_URL = base_url
+    settings.WB_PER_PAGE = args.per_page
+    settings.EXTRACT_REPORT_SAVINGS = False
+    settings.HTTP_BACKOFF_BASE = 0.05
+    settings.HTTP_RATE_LIMIT = 0
+
+    from app.etl import http_client
+    from app.etl.async_extract import fetch_many_indicator_values
+
+    codes = [f"STUB.IND.{i}" for i in range(args.indicators)]
+    versions = {code: "2025-07-01" for code in codes}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        settings.HTTP_CACHE_DIR = cache_dir
+        runs = (
+            ("no retries, no cache", dict(HTTP_MAX_RETRIES=0, HTTP_CACHE=False)),
+            ("retries, cold cache", dict(HTTP_MAX_RETRIES=5, HTTP_CACHE=True)),
+            ("warm cache", dict()),
+            ("offline", dict(HTTP_OFFLINE=True)),
+        )
+        expected = None
+        for label, overrides in runs:
+            for name, value in overrides.items():
+                setattr(settings, name, value)
+            http_client._cache = None
+            start = time.perf_counter()
+            fetched = fetch_many_indicator_values(codes, versions=versions)
+            elapsed = time.perf_counter() - start
+            failed = [code for code, records in fetched.items() if records is None]
+            if not failed and expected is None:
+                expected = fetched
+            elif not failed:
+                assert fetched == expected, f"{label}: records differ from the first complete run"
+            cache = http_client._cache
+            cache_note = f", cache {cache.hits} hits / {cache.misses} misses, {cache.size()} bytes" if cache else ""
+            print(f"{label:>21}: {elapsed:6.2f}s, {len(codes) - len(failed)}/{len(codes)} indicators complete"
+                  f"{cache_note}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# scripts/bench_load_values.py
+#
+# Rows/sec of the COPY + set-based merge loader against the old per-row upsert path,
+# and the cost of resolving codes to ids per call with and without the dimension registry.
+# Needs the configured PostgreSQL database; writes into indicator_values under
+# throwaway BENCH.* indicators and Q?? countries (ISO 3166 user-assigned codes, so no
+# real country is touched) and removes them, their topic and their values afterwards.
+#   python -m scripts.bench_load_values --rows 20000
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.data_version import bump_data_version
+from app.db.db import SessionLocal, engine
+from app.db.registry import current_registry
+from app.etl.load import load_values, resolve_value_ids
+from app.models.models import Base, Country, IndicatorMeta, IndicatorValue, Topic
+
+BENCH_TOPIC_ID = 404404
+
+
+def load_values_rowwise(values_df):
+    """The pre-COPY loader: one SELECT and one upsert per row."""
+    session = SessionLocal()
+    try:
+        indicator_map = {ind.code: ind.id for ind in session.query(IndicatorMeta).all()}
+        country_map = {c.iso3: c.id for c in session.query(Country).all()}
+        for row in values_df.itertuples():
+            ind_id = indicator_map.get(row.indicator_code)
+            ctry_id = country_map.get(row.iso3)
+            if not ind_id or not ctry_id:
+                continue
+            existing = session.query(IndicatorValue).filter_by(
+                indicator_id=ind_id, country_id=ctry_id, date=row.date
+            ).first()
+            if existing and existing.value == row.value:
+                continue
+            session.execute(insert(IndicatorValue).values(
+                indicator_id=ind_id, country_id=ctry_id, date=row.date, value=row.value
+            ).on_conflict_do_update(
+                index_elements=["indicator_id", "country_id", "date"], set_={"value": row.value}
+            ))
+        session.commit()
+    finally:
+        session.close()
+
+
+def bench_lookups(session, df, repeat=20):
+    """Per-call code -> id resolution: ORM maps and a per-row ``dict.get`` against the warm registry's
+    version check and vectorized ``map``."""
+    def orm_maps():
+        indicator_map = {ind.code: ind.id for ind in session.query(IndicatorMeta).all()}
+        country_map = {c.iso3: c.id for c in session.query(Country).all()}
+        return [(indicator_map.get(r.indicator_code), country_map.get(r.iso3)) for r in df.itertuples()]
+
+    def registry_map():
+        return resolve_value_ids(df, current_registry(session))
+
+    for label, fn in (("ORM maps + dict.get", orm_maps), ("registry + map", registry_map)):
+        fn()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        print(f"{label:>20}: {(time.perf_counter() - start) / repeat * 1000:8.2f} ms per load_values call")
+    session.rollback()
+
+
+def make_frame(n_rows, n_indicators, iso3s, seed=404):
+    rng = np.random.default_rng(seed)
+    keys = [(f"BENCH.{i}", iso3, year) for i in range(n_indicators) for iso3 in iso3s for year in range(1960, 2025)]
+    keys = keys[:n_rows]
+    df = pd.DataFrame(keys, columns=["indicator_code", "iso3", "date"])
+    df["value"] = rng.normal(size=len(df))
+    return df
+
+
+def prepare(session, n_indicators, iso3s):
+    session.execute(insert(Topic).values(id=BENCH_TOPIC_ID, name="Benchmark").on_conflict_do_nothing())
+    session.execute(insert(IndicatorMeta).values([
+        {"code": f"BENCH.{i}", "name": f"Benchmark {i}", "topic_id": BENCH_TOPIC_ID} for i in range(n_indicators)
+    ]).on_conflict_do_nothing())
+    session.execute(insert(Country).values([
+        {"iso3": iso3, "name": f"Bench {iso3}"} for iso3 in iso3s
+    ]).on_conflict_do_nothing())
+    session.commit()
+
+
+def clear_values(session):
+    ids = session.query(IndicatorMeta.id).filter(IndicatorMeta.topic_id == BENCH_TOPIC_ID)
+    session.execute(delete(IndicatorValue).where(IndicatorValue.indicator_id.in_(ids.scalar_subquery())))
+    session.commit()
+
+
+def remove_bench_dimensions(session, iso3s):
+    """Delete the benchmark's values, indicators, countries and topic; rollup rows cascade."""
+    session.rollback()  # the run may have failed mid-transaction
+    clear_values(session)
+    session.execute(delete(IndicatorMeta).where(IndicatorMeta.topic_id == BENCH_TOPIC_ID))
+    session.execute(delete(Country).where(Country.iso3.in_(iso3s)))
+    session.execute(delete(Topic).where(Topic.id == BENCH_TOPIC_ID))
+    bump_data_version(session, dimensions=True)
+    session.commit()
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    fn(df)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(df) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--indicators", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    iso3s = [f"Q{a}{b}" for a in "MNOPQRSTUV" for b in "ABCDEFGHIJ"]
+    df = make_frame(args.rows, args.indicators, iso3s)
+
+    session = SessionLocal()
+    try:
+        prepare(session, args.indicators, iso3s)
+        for label, fn in (("per-row upsert", load_values_rowwise), ("COPY + merge", load_values)):
+            clear_values(session)
+            cold, cold_rate = timed(fn, df)
+            warm, warm_rate = timed(fn, df)
+            print(f"{label:>15}: insert {cold:7.2f}s ({cold_rate:9.0f} rows/s)  "
+                  f"unchanged reload {warm:7.2f}s ({warm_rate:9.0f} rows/s)")
+        clear_values(session)
+        bench_lookups(session, df)
+    finally:
+        remove_bench_dimensions(session, iso3s)
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# scripts/bench_log_sink.py
+#
+# GET request latency through the app with the DB log sink off, synchronous and batched.
+# The sink is chosen at import time, so each mode runs in its own subprocess.
+# Needs the configured PostgreSQL database.
+#   python -m scripts.bench_log_sink --requests 500
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def run_child(n_requests):
+    from fastapi.testclient import TestClient
+    from loguru import logger
+    from app.api import create_app
+    from app.core.config import settings
+
+    client = TestClient(create_app())
+    client.get("/topics/", params={"limit": 1})  # warm up the connection pool
+
+    timings = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        client.get("/topics/", params={"limit": 1})
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{settings.LOG_DB_SINK:>8}: mean {statistics.mean(timings):6.2f} ms  "
+          f"p50 {statistics.median(timings):6.2f} ms  p99 {p99:6.2f} ms")
+    logger.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.requests)
+
+    for mode in ("off", "sync", "batched"):
+        env = dict(os.environ, LOG_DB_SINK=mode)
+        result = subprocess.run([sys.executable, "-m", "scripts.bench_log_sink", "--child", "--requests", str(args.requests)],
+                                env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        print(result.stdout.strip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# scripts/bench_replay.py
+#
+# Online extract + transform against the latency-bound stub API, then a replay of
+# the same indicators from the landing zone, in one process and sharded across
+# worker processes. Loads are no-ops, so only extract/read and transform are timed.
+# The landing zone lives in a temp directory.
+#   python -m scripts.bench_replay --indicators 16 --latency 0.1 --workers 4
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+from scripts.stub_worldbank_api import start_stub_server
+
+
+def replay_shard(codes):
+    from app.etl.runners import run_replay
+    rows = []
+    failed = run_replay(codes, loader=lambda df: rows.append(len(df)))
+    return sum(rows), failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--indicators", type=int, default=16)
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    landing_dir = tempfile.mkdtemp()
+    # spawned replay workers read their settings from the environment
+    os.environ.update(LANDING_DIR=landing_dir, HTTP_CACHE="false", LOG_DB_SINK="off")
+    settings.LANDING_DIR = landing_dir
+    settings.HTTP_CACHE = False
+
+    server, base_url = start_stub_server(latency=args.latency, n_indicators=args.indicators, n_countries=args.countries)
+    settings.WB_API_BASE_URL = base_url
+    settings.EXTRACT_REPORT_SAVINGS = False
+
+    from app.etl.runners import run_batch
+    codes = [f"STUB.IND.{i}" for i in range(args.indicators)]
+
+    rows = []
+    start = time.perf_counter()
+    run_batch(codes, {}, {}, full=True, loader=lambda df: rows.append(len(df)), save_state=lambda *a: None)
+    online = time.perf_counter() - start
+    print(f"{'online':>21}: {online:6.2f}s  {sum(rows)} rows")
+    server.shutdown()
+
+    start = time.perf_counter()
+    replayed, failed = replay_shard(codes)
+    single = time.perf_counter() - start
+    print(f"{'replay, 1 process':>21}: {single:6.2f}s  {replayed} rows, {len(failed)} failed ({online / single:.1f}x)")
+
+    shards = [codes[i::args.workers] for i in range(args.workers)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(replay_shard, shards))
+    parallel = time.perf_counter() - start
+    print(f"{f'replay, {args.workers} processes':>21}: {parallel:6.2f}s  {sum(r[0] for r in results)} rows "
+          f"({online / parallel:.1f}x, including worker start-up)")
+
+
+if __name__ == "__main__":
+    main()
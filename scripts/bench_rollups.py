@@ -0,0 +1,91 @@
+# scripts/bench_rollups.py
+#
+# Query latency of the aggregate reads computed live from indicator_values
+# against the same reads served from the rollup tables.
+# Needs the configured PostgreSQL database with loaded values; defaults to the
+# indicators with the most rows.
+#   python -m scripts.bench_rollups --indicators 5 --repeat 20
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.db import SessionLocal
+from app.etl.rollups import backfill_rollups
+from app.models.models import AGGREGATES_REGION, Country, CoverageRollup, IndicatorValue, LatestValue, RegionYearRollup
+
+YEARS = (settings.MIN_YEAR, settings.MAX_YEAR)
+
+
+def live_queries(indicator_id):
+    in_years = (IndicatorValue.date >= YEARS[0], IndicatorValue.date <= YEARS[1])
+    yield "regions", (
+        select(Country.region, IndicatorValue.date, func.avg(IndicatorValue.value),
+               func.percentile_cont(0.5).within_group(IndicatorValue.value),
+               func.min(IndicatorValue.value), func.max(IndicatorValue.value), func.count())
+        .join(Country, Country.id == IndicatorValue.country_id)
+        .where(IndicatorValue.indicator_id == indicator_id, *in_years)
+        .where(Country.region.is_not(None), Country.region != AGGREGATES_REGION)
+        .group_by(Country.region, IndicatorValue.date)
+    )
+    yield "coverage", (
+        select(IndicatorValue.date, func.count(func.distinct(IndicatorValue.country_id)))
+        .join(Country, Country.id == IndicatorValue.country_id)
+        .where(IndicatorValue.indicator_id == indicator_id, *in_years)
+        .where(Country.region.is_distinct_from(AGGREGATES_REGION))
+        .group_by(IndicatorValue.date)
+    )
+    yield "latest", (
+        select(IndicatorValue.country_id, IndicatorValue.date, IndicatorValue.value)
+        .where(IndicatorValue.indicator_id == indicator_id)
+        .distinct(IndicatorValue.country_id)
+        .order_by(IndicatorValue.country_id, IndicatorValue.date.desc())
+    )
+
+
+def rollup_queries(indicator_id):
+    yield "regions", select(RegionYearRollup).where(
+        RegionYearRollup.indicator_id == indicator_id, RegionYearRollup.year.between(*YEARS))
+    yield "coverage", select(CoverageRollup).where(
+        CoverageRollup.indicator_id == indicator_id, CoverageRollup.year.between(*YEARS))
+    yield "latest", select(LatestValue).where(LatestValue.indicator_id == indicator_id)
+
+
+def time_query(session, stmt, repeat):
+    session.execute(stmt).all()  # warm the cache
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        session.execute(stmt).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--indicators", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    backfill_rollups()
+    session = SessionLocal()
+    try:
+        ids = session.execute(
+            select(IndicatorValue.indicator_id).group_by(IndicatorValue.indicator_id)
+            .order_by(func.count().desc()).limit(args.indicators)
+        ).scalars().all()
+        for indicator_id in ids:
+            for (name, live), (_, rollup) in zip(live_queries(indicator_id), rollup_queries(indicator_id)):
+                before = time_query(session, live, args.repeat)
+                after = time_query(session, rollup, args.repeat)
+                print(f"indicator {indicator_id:>6} {name:>8}: live {before:8.2f} ms  rollup {after:8.2f} ms  "
+                      f"({before / after:5.1f}x)")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
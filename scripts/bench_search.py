@@ -0,0 +1,116 @@
+# scripts/bench_search.py
+#
+# Search latency over a synthetic indicator catalogue: the old ilike('%term%')
+# filter against the pg_trgm / full-text search and the typeahead query.
+# Needs the configured PostgreSQL database; the catalogue is written under a
+# throwaway BENCH topic and removed afterwards. --fallback instead times the
+# in-process SearchIndex against a Python substring scan, without a database.
+#   python -m scripts.bench_search --indicators 20000
+#   python -m scripts.bench_search --fallback
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.db import SessionLocal, engine
+from app.db.migrations import ensure_indexes
+from app.models.models import Base, IndicatorMeta, Topic
+from app.utils.search import QUERIES, SearchIndex
+
+BENCH_TOPIC_ID = 404404
+TERMS = ["gdp", "population", "literacy rate", "emissons", "NY.GDP", "mortality under", "elec"]
+WORDS = [
+    "gross", "domestic", "product", "population", "total", "urban", "rural", "literacy", "rate", "adult",
+    "youth", "mortality", "infant", "under", "five", "emissions", "co2", "electricity", "access", "renewable",
+    "energy", "consumption", "exports", "imports", "goods", "services", "debt", "external", "forest", "area",
+    "female", "male", "labor", "force", "participation", "unemployment", "inflation", "consumer", "prices",
+]
+UNITS = ["(current US$)", "(% of GDP)", "(% of population)", "(per 1,000 people)", "(kt)", "(annual %)"]
+
+
+def make_catalogue(n, seed=404):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        name = " ".join(rng.sample(WORDS, rng.randint(2, 5))).capitalize() + " " + rng.choice(UNITS)
+        prefix = ".".join("".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=rng.randint(2, 4))) for _ in range(3))
+        note = " ".join(rng.choices(WORDS, k=rng.randint(15, 40))).capitalize() + "."
+        rows.append({"code": f"{prefix}.{i}", "name": name, "topic_id": BENCH_TOPIC_ID, "source_note": note})
+    return rows
+
+
+def timed(fn, repeat):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def ilike_query(term):
+    pattern = f"%{term}%"
+    return (
+        select(IndicatorMeta).where(IndicatorMeta.name.ilike(pattern) | IndicatorMeta.code.ilike(pattern))
+        .order_by(IndicatorMeta.id).limit(20)
+    )
+
+
+def bench_postgres(n, repeat):
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    session = SessionLocal()
+    try:
+        session.execute(insert(Topic).values(id=BENCH_TOPIC_ID, name="Benchmark").on_conflict_do_nothing())
+        session.execute(insert(IndicatorMeta).values(make_catalogue(n)).on_conflict_do_nothing())
+        session.commit()
+        session.connection().exec_driver_sql("ANALYZE indicator_meta")
+        for term in TERMS:
+            old = timed(lambda: session.execute(ilike_query(term)).all(), repeat)
+            new = timed(lambda: session.execute(QUERIES[("indicators", "search")](term, 20)).all(), repeat)
+            ahead = timed(lambda: session.execute(QUERIES[("indicators", "typeahead")](term, 10)).all(), repeat)
+            print(f"{term:>16}: ilike {old:7.2f} ms  search {new:7.2f} ms  typeahead {ahead:7.2f} ms")
+    finally:
+        session.rollback()
+        session.execute(delete(IndicatorMeta).where(IndicatorMeta.topic_id == BENCH_TOPIC_ID))
+        session.execute(delete(Topic).where(Topic.id == BENCH_TOPIC_ID))
+        session.commit()
+        session.close()
+
+
+def bench_fallback(n, repeat):
+    rows = [(i, r["code"], r["name"], r["source_note"]) for i, r in enumerate(make_catalogue(n))]
+    start = time.perf_counter()
+    index = SearchIndex(rows)
+    print(f"SearchIndex built over {n} indicators in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def scan(term):
+        needle = term.lower()
+        return [r for r in rows if needle in r[2].lower() or needle in r[1].lower()][:20]
+
+    for term in TERMS:
+        old = timed(lambda: scan(term), repeat)
+        new = timed(lambda: index.search(term, 20), repeat)
+        ahead = timed(lambda: index.typeahead(term, 10), repeat)
+        print(f"{term:>16}: substring scan {old:7.2f} ms  search {new:7.2f} ms  typeahead {ahead:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--indicators", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fallback", action="store_true", help="Time the in-process index; no database needed")
+    args = parser.parse_args()
+    if args.fallback:
+        bench_fallback(args.indicators, args.repeat)
+    else:
+        bench_postgres(args.indicators, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/bench_serialisation.py
+#
+# Encoding cost of the list endpoints' path (ORM objects validated through
+# IndicatorValueOut, then JSON) against the streaming path (column tuples encoded
+# with orjson chunk by chunk), on synthetic rows. No database needed.
+#   python -m scripts.bench_serialisation --rows 500000
+
+import argparse
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.models import IndicatorValue
+from app.schemas.indicator_values import IndicatorValueOut
+from app.utils.streaming import encode_chunk
+
+COLUMNS = ["id", "indicator_id", "country_id", "date", "value"]
+
+
+def make_rows(n):
+    return [(i, i % 50 + 1, i % 217 + 1, 1960 + i % 65, i * 0.37) for i in range(n)]
+
+
+def orm_path(rows):
+    entities = [IndicatorValue(**dict(zip(COLUMNS, row))) for row in rows]
+    adapter = TypeAdapter(List[IndicatorValueOut])
+    return adapter.dump_json(adapter.validate_python(entities, from_attributes=True))
+
+
+def stream_path(rows, chunk_rows):
+    chunks = []
+    for start in range(0, len(rows), chunk_rows):
+        chunks.append(encode_chunk(COLUMNS, rows[start:start + chunk_rows], "ndjson", start == 0))
+    return chunks
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    start = time.perf_counter()
+    encode_chunk(COLUMNS, rows[:args.chunk_rows], "ndjson", True)
+    first_chunk = (time.perf_counter() - start) * 1000
+
+    orm_time, orm_peak = measure(orm_path, rows)
+    stream_time, stream_peak = measure(stream_path, rows, args.chunk_rows)
+    print(f"ORM + IndicatorValueOut: {orm_time:6.2f}s  peak {orm_peak:7.1f} MiB  ({args.rows / orm_time:9.0f} rows/s)")
+    print(f"tuples + orjson NDJSON:  {stream_time:6.2f}s  peak {stream_peak:7.1f} MiB  ({args.rows / stream_time:9.0f} rows/s)")
+    print(f"first {args.chunk_rows}-row chunk ready after {first_chunk:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# scripts/bench_stream_memory.py
+#
+# Peak RSS of the batch vs streaming pipeline modes against the local stub API.
+# Each mode runs in its own subprocess with a no-op loader, so only extract and
+# transform memory is measured.
+#   python -m scripts.bench_stream_memory --countries 260 --indicators 8
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+
+def run_child(mode, codes):
+    from app.core.config import settings
+    from app.etl.runners import run_batch, run_streaming
+
+    loaded = []
+    loader = lambda df: loaded.append(len(df))
+    save_state = lambda *args: None
+
+    start = time.perf_counter()
+    if mode == "stream":
+        run_streaming(codes, {}, loader=loader, save_state=save_state)
+    else:
+        run_batch(codes, {}, {}, full=True, loader=loader, save_state=save_state)
+    elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>6}: peak RSS {peak_mb:7.1f} MB, {sum(loaded)} rows in {len(loaded)} loads, {elapsed:.2f}s "
+          f"(STREAM_BATCH_ROWS={settings.STREAM_BATCH_ROWS}, STREAM_QUEUE_PAGES={settings.STREAM_QUEUE_PAGES})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--countries", type=int, default=260)
+    parser.add_argument("--indicators", type=int, default=8)
+    parser.add_argument("--min-year", type=int, default=1960)
+    parser.add_argument("--child", choices=["batch", "stream"])
+    args = parser.parse_args()
+
+    codes = [f"STUB.IND.{i}" for i in range(args.indicators)]
+    if args.child:
+        return run_child(args.child, codes)
+
+    # the stub runs in its own process: ru_maxrss survives fork+exec, so a large parent would inflate the children
+    port = 8405
+    stub = subprocess.Popen([sys.executable, "-m", "scripts.stub_worldbank_api", "--port", str(port),
+                             "--countries", str(args.countries), "--indicators", str(args.indicators)],
+                            stdout=subprocess.PIPE, text=True)
+    stub.stdout.readline()
+    env = dict(os.environ, WB_API_BASE_URL=f"http://127.0.0.1:{port}/v2", MIN_YEAR=str(args.min_year),
+               WB_PER_PAGE="1000", EXTRACT_REPORT_SAVINGS="false", HTTP_CACHE="false")
+    try:
+        for mode in ("batch", "stream"):
+            subprocess.run([sys.executable, "-m", "scripts.bench_stream_memory", "--child", mode,
+                            "--indicators", str(args.indicators)], env=env, check=True)
+    finally:
+        stub.terminate()
+
+if __name__ == "__main__":
+    main()
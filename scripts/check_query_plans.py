@@ -0,0 +1,98 @@
+# scripts/check_query_plans.py
+#
+# EXPLAIN every API and dashboard read query against the configured database and
+# fail if any of them plans a sequential scan. Sequential scans are disabled for
+# the check, so the planner only falls back to one when no index can serve the
+# query. The result therefore does not depend on table sizes.
+#   python -m scripts.check_query_plans
+
+import sys
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.db.db import SessionLocal
+from app.db.queries import indicator_data_query
+from app.export.export import values_query
+from app.routers.aggregates import coverage_query, growth_query, top_query
+from app.routers.indicator_values import stream_query
+from app.routers.series import series_query
+from app.utils.search import QUERIES as SEARCH_QUERIES
+from app.models.models import (
+    Country, CoverageRollup, ETLLog, IndicatorMeta, IndicatorValue, LatestValue, RegionYearRollup, Topic
+)
+
+VALUE_ORDER = (IndicatorValue.indicator_id, IndicatorValue.country_id, IndicatorValue.date)
+
+
+def queries():
+    iv = select(IndicatorValue)
+    yield "GET /indicator-values", iv.order_by(*VALUE_ORDER).limit(10)
+    yield "GET /indicator-values?indicator_id", iv.where(IndicatorValue.indicator_id == 1).order_by(*VALUE_ORDER).limit(10)
+    yield "GET /indicator-values?country_id", iv.where(IndicatorValue.country_id == 1).order_by(*VALUE_ORDER).limit(10)
+    yield "GET /indicator-values?indicator_id&country_id", iv.where(
+        IndicatorValue.indicator_id == 1, IndicatorValue.country_id == 1).order_by(*VALUE_ORDER).limit(10)
+    yield "GET /indicator-values?cursor", iv.where(tuple_(*VALUE_ORDER) > tuple_(1, 1, 2000)).order_by(*VALUE_ORDER).limit(10)
+    yield "GET /indicator-values/{id}", iv.where(IndicatorValue.id == 1)
+    yield "GET /indicator-values/stream", stream_query()
+    yield "GET /indicator-values/stream?indicator&country&years", stream_query([1, 2], [1, 2, 3], 2000, 2023)
+    yield "GET /exports/indicator-values", values_query([1, 2], None, None, 2000, 2023)
+    yield "GET /exports/indicator-values?topic&country", values_query(None, 1, [1, 2, 3], 2000, 2023)
+    yield "GET /series", series_query([1, 2], None, 2000, 2023)
+    yield "GET /series?country", series_query([1, 2], [1, 2, 3], 2000, 2023)
+    yield "GET /countries", select(Country).order_by(Country.id).limit(10)
+    yield "GET /countries/{id}", select(Country).where(Country.id == 1)
+    yield "GET /topics", select(Topic).order_by(Topic.id).limit(10)
+    yield "GET /topics/{id}", select(Topic).where(Topic.id == 1)
+    yield "GET /indicators-meta", select(IndicatorMeta).order_by(IndicatorMeta.id).limit(10)
+    yield "GET /indicators-meta/{id}", select(IndicatorMeta).where(IndicatorMeta.id == 1)
+    yield "GET /aggregates/regions", select(RegionYearRollup).where(
+        RegionYearRollup.indicator_id == 1, RegionYearRollup.year >= 2000, RegionYearRollup.year <= 2023)
+    yield "GET /aggregates/coverage", select(CoverageRollup).where(
+        CoverageRollup.indicator_id == 1, CoverageRollup.year >= 2000, CoverageRollup.year <= 2023)
+    yield "GET /aggregates/coverage?include_aggregates", coverage_query(1, 2000, 2023)
+    yield "GET /aggregates/growth", growth_query(1, None, 2000, 2023)
+    yield "GET /aggregates/growth?country", growth_query(1, [1, 2, 3], 2000, 2023)
+    yield "GET /aggregates/top", top_query(1, 2000, 2023, 10, "desc", False)
+    yield "GET /aggregates/top?include_aggregates", top_query(1, 2000, 2023, 10, "desc", True)
+    yield "GET /aggregates/latest", select(LatestValue).where(LatestValue.indicator_id == 1)
+    yield "GET /indicators-meta?search", select(IndicatorMeta).where(
+        IndicatorMeta.name.ilike("%gdp%") | IndicatorMeta.code.ilike("%gdp%")).order_by(IndicatorMeta.id).limit(10)
+    yield "GET /search", SEARCH_QUERIES[("indicators", "search")]("gross domestic", 20)
+    yield "GET /search/typeahead", SEARCH_QUERIES[("indicators", "typeahead")]("popul", 10)
+    yield "dashboard get_indicators_by_topic", select(IndicatorMeta.id, IndicatorMeta.code, IndicatorMeta.name).where(
+        IndicatorMeta.topic_id == 1)
+    yield "dashboard get_indicator_data", indicator_data_query([1, 2], [1, 2, 3], 2010, 2023)
+    yield "dashboard get_latest_logs", select(ETLLog.timestamp, ETLLog.level, ETLLog.message).order_by(
+        ETLLog.timestamp.desc()).limit(50)
+
+
+def walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def main():
+    session = SessionLocal()
+    failures = 0
+    try:
+        session.execute(select(1))
+        session.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for name, stmt in queries():
+            sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+            nodes = list(walk(plan[0]["Plan"]))
+            seq = [n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"]
+            scans = sorted({n["Node Type"] for n in nodes if "Scan" in n["Node Type"]})
+            status = "FAIL" if seq else "ok"
+            failures += bool(seq)
+            print(f"{status:>4}  {name:<48} {', '.join(scans)}" + (f"  (seq scan on {', '.join(seq)})" if seq else ""))
+    finally:
+        session.rollback()
+        session.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# scripts/migrate_db.py
+#
+# Bring an existing database up to the current models: create missing tables,
+# then build missing indexes concurrently.
+#   python -m scripts.migrate_db
+
+import os
+
+os.environ["DB_PROFILE"] = "etl"  # no statement timeout for index builds
+
+from app.db.db import engine
+from app.db.migrations import ensure_indexes
+from app.models.models import Base
+from app.utils.logger import logger
+
+if __name__ == "__main__":
+    Base.metadata.create_all(engine)
+    built = ensure_indexes(engine)
+    logger.info(f"Migration complete; built {len(built)} indexes: {', '.join(built) or 'none'}")
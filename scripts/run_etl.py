@@ -1,4 +1,20 @@
+import argparse
+import os
+
+os.environ["DB_PROFILE"] = "etl"  # before app.db.db builds the engine; not inherited from a caller's profile
+
 from app.etl.pipeline import main as run_etl
 
 if __name__ == "__main__":
-    run_etl()
+    parser = argparse.ArgumentParser(description="Run the World Bank ETL pipeline.")
+    parser.add_argument("--full", action="store_true", help="Re-fetch and reload every indicator, ignoring sync state")
+    parser.add_argument("--mode", choices=["batch", "stream", "replay"], default=None,
+                        help="batch loads whole indicators; stream pipes pages through bounded queues; "
+                             "replay re-transforms and loads the landed raw payloads offline (default: ETL_MODE)")
+    parser.add_argument("--sample", type=int, default=None,
+                        help="Only process a random sample of this many indicators (default: whole catalogue)")
+    parser.add_argument("--random-state", type=int, default=404, help="Seed for --sample")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes to shard indicators across (default: ETL_WORKERS, or ETL_REPLAY_WORKERS for replay)")
+    args = parser.parse_args()
+
+    run_etl(full=args.full, mode=args.mode, sample=args.sample, random_state=args.random_state, workers=args.workers)
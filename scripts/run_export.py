@@ -0,0 +1,51 @@
+# scripts/run_export.py
+#
+# Export indicator values to a Parquet, Arrow IPC stream or gzip CSV file.
+#   python -m scripts.run_export --indicator NY.GDP.MKTP.CD --format parquet --out gdp.parquet
+#   python -m scripts.run_export --topic 3 --format csv --wide --out topic3.csv.gz
+
+import argparse
+import sys
+
+from app.core.config import settings
+from app.db.db import SessionLocal
+from app.db.registry import current_registry
+from app.export.export import FORMATS, write_export
+from app.utils.logger import logger
+from app.utils.resolve import lookup_countries, lookup_indicators, split_identifiers
+
+
+def resolve_ids(lookup, dimensions, identifiers):
+    """Ids of ``identifiers`` through the dimension registry, matched as the API matches them."""
+    rows, missing = lookup(dimensions, *split_identifiers(identifiers))
+    if missing:
+        sys.exit(f"Unknown identifiers: {sorted(map(str, missing))}")
+    return [r.id for r in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export indicator values to a file.")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--indicator", action="append", default=[], help="Indicator id or code; repeat for several")
+    parser.add_argument("--topic", type=int, default=None, help="Export every indicator of this topic")
+    parser.add_argument("--country", action="append", default=[], help="Country id or ISO3 code; repeat for several")
+    parser.add_argument("--year-min", type=int, default=settings.MIN_YEAR)
+    parser.add_argument("--year-max", type=int, default=settings.MAX_YEAR)
+    parser.add_argument("--wide", action="store_true", help="One row per indicator and country, one column per year")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="Rows held in memory at a time (default: EXPORT_CHUNK_ROWS)")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        dimensions = current_registry(session)
+    finally:
+        session.close()
+    indicator_ids = resolve_ids(lookup_indicators, dimensions, args.indicator) if args.indicator else None
+    country_ids = resolve_ids(lookup_countries, dimensions, args.country) if args.country else None
+
+    written = write_export(
+        args.out, args.format, indicator_ids=indicator_ids, topic_id=args.topic, country_ids=country_ids,
+        year_min=args.year_min, year_max=args.year_max, wide=args.wide, chunk_rows=args.chunk_rows,
+    )
+    logger.info(f"Wrote {written} bytes to {args.out}")
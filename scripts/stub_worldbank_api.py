@@ -0,0 +1,152 @@
+# scripts/stub_worldbank_api.py
+#
+# Local stand-in for the World Bank v2 API, serving deterministic synthetic data.
+#   python -m scripts.stub_worldbank_api --port 8404 --latency 0.05
+#   WB_API_BASE_URL=http://127.0.0.1:8404/v2 python -m scripts.run_etl
+
+import argparse
+import json
+import math
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIRST_YEAR = 1960
+LAST_YEAR = 2024
+
+
+def _letters(n, width):
+    return "".join(chr(65 + n // 26 ** i % 26) for i in reversed(range(width)))
+
+
+class StubData:
+    def __init__(self, n_countries=200, n_indicators=50, n_topics=20):
+        self.topics = [{"id": str(t), "value": f"Topic {t}", "sourceNote": ""} for t in range(1, n_topics + 1)]
+        self.countries = [{
+            "id": _letters(c, 3),
+            "iso2Code": _letters(c, 2),
+            "name": f"Country {c}",
+            "region": {"id": f"R{c % 7}", "iso2code": f"R{c % 7}", "value": f"Region {c % 7}"},
+        } for c in range(n_countries)]
+        self.indicators = [{
+            "id": f"STUB.IND.{i}",
+            "name": f"Stub indicator {i}",
+            "sourceNote": f"Synthetic series number {i}.",
+            "topics": [{"id": str(i % n_topics + 1), "value": f"Topic {i % n_topics + 1}"}],
+        } for i in range(n_indicators)]
+        self._values = {}
+
+    def indicator_values(self, code):
+        if code in self._values:
+            return self._values[code]
+        seed = zlib.crc32(code.encode())
+        records = []
+        for country in self.countries:
+            for year in range(LAST_YEAR, FIRST_YEAR - 1, -1):
+                h = zlib.crc32(f"{country['id']}{year}".encode(), seed)
+                records.append({
+                    "indicator": {"id": code, "value": code},
+                    "country": {"id": country["iso2Code"], "value": country["name"]},
+                    "countryiso3code": country["id"],
+                    "date": str(year),
+                    "value": None if h % 10 == 0 else round(h / 1e6, 3),
+                    "unit": "",
+                    "obs_status": "",
+                    "decimal": 0,
+                })
+        self._values[code] = records
+        return records
+
+
+def _page(records, page, per_page):
+    pages = max(1, math.ceil(len(records) / per_page))
+    header = {"page": page, "pages": pages, "per_page": per_page, "total": len(records),
+              "sourceid": "2", "lastupdated": "2025-07-01"}
+    return [header, records[(page - 1) * per_page:page * per_page] or None]
+
+
+def make_handler(data, latency=0.0, fail_rate=0.0, fail_times=None):
+    """``fail_rate`` of the paths answer 502; with ``fail_times`` only their first that many requests do."""
+    failures = {}
+    lock = threading.Lock()
+
+    def should_fail(path):
+        if not fail_rate or zlib.crc32(path.encode()) % 1000 >= fail_rate * 1000:
+            return False
+        if fail_times is None:
+            return True
+        with lock:
+            failures[path] = failures.get(path, 0) + 1
+            return failures[path] <= fail_times
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            page = int(query.get("page", 1))
+            per_page = int(query.get("per_page", 50))
+            path = parts.path.rstrip("/").split("/")[2:]
+
+            if latency:
+                time.sleep(latency)
+            if should_fail(self.path):
+                return self._send(502, b"Bad Gateway")
+
+            if path == ["topic"]:
+                body = _page(data.topics, page, per_page)
+            elif path == ["indicator"]:
+                body = _page(data.indicators, page, per_page)
+            elif path == ["country"]:
+                body = _page(data.countries, page, per_page)
+            elif len(path) == 4 and path[:3] == ["country", "all", "indicator"]:
+                records = data.indicator_values(path[3])
+                if "date" in query:
+                    first, _, last = query["date"].partition(":")
+                    records = [r for r in records if int(first) <= int(r["date"]) <= int(last or first)]
+                if "mrv" in query:
+                    records = [r for r in records if LAST_YEAR - int(r["date"]) < int(query["mrv"])]
+                body = _page(records, page, per_page)
+            else:
+                return self._send(404, b"Not Found")
+            self._send(200, json.dumps(body).encode())
+
+        def _send(self, status, payload):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def start_stub_server(port=0, latency=0.0, fail_rate=0.0, fail_times=None, **data_kwargs):
+    """Start the stub in a daemon thread; returns ``(server, base_url)``."""
+    handler = make_handler(StubData(**data_kwargs), latency, fail_rate, fail_times)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v2"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a synthetic World Bank v2 API.")
+    parser.add_argument("--port", type=int, default=8404)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay added to every response")
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--indicators", type=int, default=50)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.latency, n_countries=args.countries, n_indicators=args.indicators)
+    print(f"Stub World Bank API at {base_url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,70 @@
+import asyncio
+
+from app.db.registry import DimensionRegistry
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows[0][0] if self.rows else None
+
+
+class FakeAsyncSession:
+    """Answers the registry's three queries, yielding to the event loop like an asyncpg round trip."""
+
+    def __init__(self, version=1):
+        self.version = version
+        self.queries = []
+
+    async def execute(self, stmt):
+        sql = str(stmt)
+        self.queries.append(sql)
+        await asyncio.sleep(0.01)
+        if "data_version" in sql:
+            return FakeResult([(self.version,)])
+        if "indicator_meta" in sql:
+            return FakeResult([("SP.POP.TOTL", 1), ("NY.GDP.MKTP.CD", 2)])
+        return FakeResult([("VNM", 10), ("FRA", 11)])
+
+
+def test_concurrent_forced_refreshes_do_not_block_the_loop():
+    registry = DimensionRegistry(interval=60)
+    db = FakeAsyncSession()
+
+    async def main():
+        await asyncio.wait_for(
+            asyncio.gather(*(registry.refresh_async(db, force=True) for _ in range(5))), timeout=5
+        )
+
+    asyncio.run(main())
+    assert registry.version == 1
+    assert registry.indicator_id("sp.pop.totl") == 1
+    assert registry.country_codes == {10: "VNM", 11: "FRA"}
+
+
+def test_concurrent_stale_refreshes_reload_once():
+    registry = DimensionRegistry(interval=60)
+    db = FakeAsyncSession()
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(*(registry.refresh_async(db) for _ in range(5))), timeout=5)
+
+    asyncio.run(main())
+    assert len(db.queries) == 3
+    assert registry.country_id("fra") == 11
+
+
+def test_forced_refresh_picks_up_a_new_version():
+    registry = DimensionRegistry(interval=60)
+    db = FakeAsyncSession()
+    asyncio.run(registry.refresh_async(db))
+    db.version = 2
+    asyncio.run(registry.refresh_async(db))
+    assert registry.version == 1
+    asyncio.run(registry.refresh_async(db, force=True))
+    assert registry.version == 2
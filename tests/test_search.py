@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.utils import search
+from app.utils.search import SearchIndex, run_search
+
+INDICATORS = [
+    (1, "NY.GDP.MKTP.CD", "GDP (current US$)", "Gross domestic product at purchaser's prices"),
+    (2, "NY.GDP.PCAP.CD", "GDP per capita (current US$)", "Gross domestic product divided by midyear population"),
+    (3, "SP.POP.TOTL", "Population, total", "Total population counts all residents"),
+    (4, "SP.POP.GROW", "Population growth (annual %)", None),
+    (5, "SE.PRM.ENRR", "School enrollment, primary (% gross)", None),
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSqliteSession:
+    """An async session on a database without pg_trgm, so ``run_search`` takes the in-process fallback."""
+
+    def __init__(self, rows, version=1):
+        self.rows = rows
+        self.version = version
+        self.loads = 0
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+    async def run_sync(self, fn, *args):
+        return self.version
+
+    async def execute(self, stmt):
+        self.loads += 1
+        return FakeResult(list(self.rows))
+
+
+def ids(results):
+    return [r["id"] for r in results]
+
+
+def test_search_ranks_matches_and_tolerates_typos():
+    index = SearchIndex(INDICATORS)
+    assert ids(index.search("gdp per", 10)) == [2]
+    # both GDP series match through their notes; equal scores fall back to id order
+    assert ids(index.search("gross domestic", 10)) == [1, 2]
+    assert ids(index.search("populaton", 10)) == [3]
+    assert index.search("zzz", 10) == []
+
+
+def test_typeahead_prefers_code_prefixes_then_word_prefixes():
+    index = SearchIndex(INDICATORS)
+    results = index.typeahead("sp.pop", 10)
+    assert ids(results) == [3, 4]
+    assert all(r["score"] >= 1 for r in results)
+    assert ids(index.typeahead("popul", 10)) == [3, 4, 2]
+    assert ids(index.typeahead("gdp per cap", 10)) == [2]
+    assert ids(index.typeahead("popul", 1)) == [3]
+
+
+def test_fallback_index_is_rebuilt_when_the_dimension_version_moves():
+    search._fallback.clear()
+    db = FakeSqliteSession(INDICATORS)
+
+    assert ids(asyncio.run(run_search(db, "indicators", "search", "population", 10)))[0] == 3
+    asyncio.run(run_search(db, "indicators", "typeahead", "popul", 10))
+    assert db.loads == 1
+
+    db.rows = INDICATORS + [(6, "SP.POP.0014.TO", "Population ages 0-14, total", None)]
+    assert 6 not in ids(asyncio.run(run_search(db, "indicators", "typeahead", "popul", 10)))
+    db.version = 2
+    assert 6 in ids(asyncio.run(run_search(db, "indicators", "typeahead", "popul", 10)))
+    assert db.loads == 2
+    search._fallback.clear()
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from app.core.config import settings
+from app.etl.transform import transform_indicator_values
+
+
+def row_by_row(values_raw):
+    """The per-record parse ``transform_indicator_values`` replaced, kept as the reference."""
+    rows = []
+    for d in values_raw:
+        try:
+            year = int(d["date"])
+        except ValueError:
+            continue
+        if d.get("value") is None:
+            continue
+        if year < settings.MIN_YEAR or year > settings.MAX_YEAR:
+            continue
+        rows.append((d["indicator"]["id"], d["countryiso3code"], year, float(d["value"])))
+    return rows
+
+
+def records(dates, value=1.5):
+    return [
+        {"indicator": {"id": "SP.POP.TOTL"}, "countryiso3code": f"C{i:02d}", "date": date, "value": value}
+        for i, date in enumerate(dates)
+    ]
+
+
+def columnar(values_raw):
+    df = transform_indicator_values(values_raw)
+    return [(r.indicator_code, r.iso3, int(r.date), r.value) for r in df.itertuples(index=False)]
+
+
+EDGE_DATES = [
+    "2005", " 2005", "2005 ", "\t2010\n", "+2012", "2_015", "٢٠٠٥", "2005M01", "2005Q1", "20O5", "", "   ",
+    "-2005", "1999", "2024", str(settings.MIN_YEAR), str(settings.MAX_YEAR), "02005", "99999999999999999999999",
+]
+
+
+def test_matches_row_by_row_on_edge_case_dates():
+    raw = records(EDGE_DATES)
+    assert columnar(raw) == row_by_row(raw)
+    assert {year for _, _, year, _ in columnar(raw)} == {2005, 2010, 2012, 2015, settings.MIN_YEAR, settings.MAX_YEAR}
+
+
+def test_matches_row_by_row_on_nulls_and_mixed_widths():
+    raw = records(["2001", "2002", "2003M07", "7", "2004"]) + records(["2006", "2007"], value=None)
+    raw[1]["value"] = 0.0
+    assert columnar(raw) == row_by_row(raw)
+    assert [year for _, _, year, _ in columnar(raw)] == [2001, 2002, 2004]
+
+
+def test_short_dates_only():
+    raw = records(["7", "20", " 99"])
+    assert columnar(raw) == row_by_row(raw) == []
+
+
+def test_empty_input_keeps_the_column_types():
+    df = transform_indicator_values([])
+    assert list(df.columns) == ["indicator_code", "iso3", "date", "value"]
+    assert df["date"].dtype == "int16"
+    assert pd.api.types.is_float_dtype(df["value"])